@@ -0,0 +1,18 @@
+"""Asyncio interface to the Euroleague Basketball API.
+
+Requires the optional dependency aiohttp. The coroutines of
+:mod:`hoopster.aio.elb` mirror :mod:`hoopster.elb` and share one
+:class:`AsyncSession`, so many requests can be fanned out from a single
+event loop::
+
+    import asyncio
+    from hoopster.aio import elb
+
+    async def main():
+        return await asyncio.gather(*[elb.team(c) for c in codes])
+"""
+
+from hoopster.aio.client import (AsyncSession, get_session, set_session,
+                                 close)
+
+__all__ = ['AsyncSession', 'get_session', 'set_session', 'close']
@@ -0,0 +1,319 @@
+"""Asynchronous utility function for calling the API.
+
+This module requires the optional dependency aiohttp.
+"""
+
+import asyncio
+import time
+from urllib.parse import urlencode
+
+from hoopster.client import (HTTPError, _as_list, _cache_lookup,
+                             _cache_response, _record_request, get_decoder,
+                             get_metrics, get_rate_limiter, get_retry_policy)
+from hoopster import tracing
+from hoopster.constants import VALID_REQUEST_METHODS
+from hoopster.retry import Attempt
+from hoopster.singleflight import AsyncSingleFlight
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class Response:
+    """Fully read response of an asynchronous request.
+
+    Mimics the subset of :class:`requests.Response` used by hoopster.
+    """
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return get_decoder()(self.content)
+
+    def __repr__(self):
+        return '<Response [{}]>'.format(self.status_code)
+
+
+async def _close_at_shutdown(session):
+    try:
+        yield
+    finally:
+        if not session.closed:
+            await session.close()
+
+
+class AsyncSession:
+    """Pool of persistent HTTP connections for asyncio.
+
+    The underlying :class:`aiohttp.ClientSession` is created on first use
+    inside the running event loop, and closed when that loop shuts down,
+    e.g. at the end of :func:`asyncio.run`. The session can then be used
+    again in another loop, but not by two running loops at once.
+
+    Parameters
+    ----------
+    limit : int, optional
+        Maximum number of simultaneous connections.
+    limit_per_host : int, optional
+        Maximum number of simultaneous connections per host.
+    keepalive_timeout : float, optional
+        Time to keep an idle connection open, in seconds.
+    concurrency : int, optional
+        Maximum number of requests in flight at the same time. Extra
+        requests wait for a free slot.
+    headers : dict, optional
+        Default HTTP headers sent with every request.
+
+    Examples
+    --------
+    >>> async with AsyncSession(concurrency=50) as session:  # doctest: +SKIP
+    ...     previous = set_session(session)
+    ...     await elb.games('E', 'E2021')
+    """
+
+    def __init__(self, limit=100, limit_per_host=10, keepalive_timeout=15,
+                 concurrency=20, headers=None):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for hoopster.aio. "
+                              "Install it with: pip install aiohttp")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.concurrency = concurrency
+        self.headers = dict(headers or {})
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+        self._closer = None
+
+    async def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed \
+                and self._loop is not loop and self._loop.is_running():
+            raise RuntimeError("AsyncSession is in use by another running "
+                               "event loop")
+        if self._session is None or self._loop is not loop \
+                or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  headers=self.headers)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+            # the loop closes its pending async generators when it shuts
+            # down, closing the session while the loop still runs
+            self._closer = _close_at_shutdown(self._session)
+            await self._closer.__anext__()
+        return self._session
+
+    async def request(self, method, url, json=None, headers=None,
+                      timeout=None):
+        """Send a request through the connection pool.
+
+        Returns
+        -------
+        response : Response
+            response with its body already read
+        """
+        session = await self._bind()
+        if timeout is not None:
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self._semaphore:
+            async with session.request(method, url, json=json,
+                                       headers=headers,
+                                       timeout=timeout) as res:
+                content = await res.read()
+                return Response(str(res.url), res.status, res.headers,
+                                content)
+
+    async def close(self):
+        """Close all pooled connections."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+_session = None
+_flights = AsyncSingleFlight()
+
+
+def get_session():
+    """Return the session shared by all asynchronous API calls."""
+    global _session
+    if _session is None:
+        _session = AsyncSession()
+    return _session
+
+
+def set_session(session):
+    """Replace the session shared by all asynchronous API calls.
+
+    Parameters
+    ----------
+    session : AsyncSession or None
+        New shared session. None restores a default one on next use.
+
+    Returns
+    -------
+    previous : AsyncSession or None
+        The session that was in use. It is not closed.
+    """
+    global _session
+    previous, _session = _session, session
+    return previous
+
+
+async def close():
+    """Close the connections of the shared session."""
+    previous = set_session(None)
+    if previous is not None:
+        await previous.close()
+
+
+async def make_request(url, method, headers=None, data=None, timeout=None,
+                       hooks=None, session=None, retry=None):
+    """Make the request to the API.
+
+    Parameters
+    ----------
+    url : str
+    method : str
+    headers : dict, optional
+        Dictionary of HTTP Headers to send
+    data : dict, optional
+        A JSON serializable Python object to send in the body
+    timeout : int, optional
+        How long to wait for the server to send data before giving up
+    hooks : dict, optional
+        The callables of the ``'attempt'`` event receive a
+        :class:`hoopster.retry.Attempt` after each attempt.
+    session : AsyncSession, optional
+        Session used to send the request. Default: the shared session.
+    retry : RetryPolicy, optional
+        Retry policy of the request. Default: the policy shared with
+        :func:`hoopster.client.make_request`.
+
+    Returns
+    -------
+    response : Response
+        response value
+    """
+    if method not in VALID_REQUEST_METHODS:
+        raise ValueError("Incorrect request method. method should be "
+                         "{}".format(VALID_REQUEST_METHODS))
+
+    attempt_hooks = _as_list((hooks or {}).get('attempt', []))
+    session = session or get_session()
+    retry = retry or get_retry_policy()
+    with tracing.span('fetch', method=method, url=url) as span:
+        number = 0
+        first = time.perf_counter()
+        while True:
+            number += 1
+            response = error = None
+            await get_rate_limiter().acquire_async(url)
+            start = time.perf_counter()
+            try:
+                response = await session.request(method, url, json=data,
+                                                 headers=headers,
+                                                 timeout=timeout)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            delay = retry.delay(method, number, response, error)
+            if attempt_hooks:
+                attempt = Attempt(method, url, number, elapsed,
+                                  getattr(response, 'status_code', None),
+                                  error, delay)
+                for hook in attempt_hooks:
+                    hook(attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        span.set(attempts=number,
+                 status_code=getattr(response, 'status_code', None))
+
+    metrics = get_metrics()
+    if metrics is not None:
+        _record_request(metrics, url, response, error,
+                        time.perf_counter() - first, number)
+    if error is not None:
+        raise error
+    if response.status_code >= 400:
+        raise HTTPError(response)
+
+    if response.status_code == 204:
+        return None
+    return response
+
+
+async def post(url, body=None, **kwargs):
+    """Handle POST requests to add new information."""
+    return await make_request(url=url, method='POST', data=body, **kwargs)
+
+
+async def get(url, params=None, **kwargs):
+    """Handle GET requests to obtain information."""
+    if params:
+        url += '?' + urlencode(params)
+    return await make_request(url=url, method='GET', **kwargs)
+
+
+async def get_json(url, params=None, **kwargs):
+    """Handle GET requests and return the decoded JSON content.
+
+    Shares the cache of :func:`hoopster.client.get_json`. Concurrent
+    calls for the same url share a single request and decoding.
+    """
+    if params:
+        url += '?' + urlencode(params)
+    entry = _cache_lookup(url)
+    now = time.time()
+    if entry is not None and entry.is_fresh(now):
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.record_cache(url, 'hit')
+        return entry.data
+    return await _flights.do(url, _fetch_json, url, entry, now, **kwargs)
+
+
+async def _fetch_json(url, entry, now, headers=None, **kwargs):
+    headers = dict(headers or {})
+    if entry is not None:
+        headers.update(entry.validators())
+    response = await make_request(url=url, method='GET',
+                                  headers=headers or None, **kwargs)
+    return _cache_response(url, response, entry, now)
+
+
+async def delete(url, **kwargs):
+    """Handle DELETE requests to Remove information."""
+    return await make_request(url=url, method='DELETE', **kwargs)
+
+
+async def put(url, body=None, **kwargs):
+    """Handle PUT requests to modify existing information."""
+    return await make_request(url=url, method='PUT', data=body, **kwargs)
+
+
+async def patch(url, body=None, **kwargs):
+    """Handle PATCH requests."""
+    return await make_request(url=url, method='PATCH', data=body, **kwargs)
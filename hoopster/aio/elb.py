@@ -0,0 +1,379 @@
+"""Asynchronous version of :mod:`hoopster.elb`.
+
+Every function is a coroutine returning the same dataclasses as its
+synchronous counterpart.
+"""
+
+import asyncio
+import collections
+import itertools
+import warnings
+
+import hoopster.aio.client as client
+import hoopster.elb as elb
+import hoopster.tracing as tracing
+import hoopster.utils as utils
+from hoopster.client import build_url
+from hoopster.elb import (Venue, Country, Competition, Coach, Bio, Referee,
+                          Person, Team, GameRecord, Video, Season,
+                          PlayerSeason, Group, PhaseType, GameTeam, Game,
+                          Stats, PlayerStats, GamePlayerStats, GameTeamStats,
+                          GameStats)
+
+__all__ = ['Venue', 'Country', 'Competition', 'Coach', 'Bio', 'Referee',
+           'Person', 'Team', 'GameRecord', 'Video', 'Season', 'PlayerSeason',
+           'Group', 'PhaseType', 'GameTeam', 'Game', 'Stats', 'PlayerStats',
+           'GamePlayerStats', 'GameTeamStats', 'GameStats', 'referees_1',
+           'all_referees', 'referee', 'venues', 'venue', 'all_profile',
+           'profile', 'profiles', 'all_teams', 'team', 'game_records',
+           'player_highs', 'season_records', 'latest_team_videos',
+           'all_competitions', 'competition', 'all_seasons', 'season',
+           'games', 'game_stats', 'season_game_stats', 'iter_profiles',
+           'iter_referees', 'iter_venues', 'iter_teams', 'fetch_all']
+
+
+async def _get_json(*path, **params):
+    params.setdefault('version', 2.0)
+    return await client.get_json(build_url(*path, **params))
+
+
+async def referees_1():
+    """Get all referees with the API v1. Experimental.
+    """
+    res = await client.get(build_url('referees', version=1.0))
+    return elb._parse_referees(utils.remove_invalid_characters(res.text))
+
+
+async def all_referees(year=None, offset=0, limit=500, competition_code=None):
+    """Retrieve all registered referees from Euroleague BasketBall.
+
+    See :func:`hoopster.elb.all_referees`.
+    """
+    params = {'offset': offset, 'limit': limit}
+    path = ('referees', )
+    if competition_code and year is None:
+        path = ('competitions', competition_code, 'referees')
+    elif competition_code and year:
+        season_code = f'{competition_code}{year}'
+        path = ('competitions', competition_code, 'seasons', season_code,
+                'referees')
+    elif competition_code is None and year:
+        warnings.warn('No competitions found, returning all referees')
+
+    data = await _get_json(*path, **params)
+    return [Referee.from_api(r) for r in data]
+
+
+async def referee(referee_code):
+    """Retrieve a referee information.
+
+    See :func:`hoopster.elb.referee`.
+    """
+    return Referee.from_api(await _get_json('referees', referee_code))
+
+
+async def venues(offset=0, limit=500):
+    """Retrieve all venues.
+
+    See :func:`hoopster.elb.venues`.
+    """
+    data = await _get_json('venues', offset=offset, limit=limit)
+    return [Venue.from_api(r) for r in data]
+
+
+async def venue(venue_code):
+    """Retrieve a venue information.
+
+    See :func:`hoopster.elb.venue`.
+    """
+    return Venue.from_api(await _get_json('venues', venue_code))
+
+
+async def all_profile(offset=0, limit=500, with_bio=True, with_seasons=True):
+    """Retrieve all registered profile at Euroleague Basketball.
+
+    See :func:`hoopster.elb.all_profile`.
+    """
+    data = await _get_json('people', offset=offset, limit=limit)
+    return [Person.from_api(r) for r in data]
+
+
+@tracing.traced()
+async def profile(person_code, career_history=True):
+    """Retrieve one registered person from Euroleague BasketBall.
+
+    See :func:`hoopster.elb.profile`, whose lazy mode has no asynchronous
+    counterpart.
+    """
+    requests = [_get_json('people', person_code),
+                _get_json('people', person_code, 'bio')]
+    if career_history:
+        requests.append(_get_json('people', person_code, 'seasons'))
+    data, bio, *career = await asyncio.gather(*requests)
+    return elb._parse_profile(data, bio, career[0] if career else None)
+
+
+@tracing.traced()
+async def profiles(person_codes, career_history=True, concurrency=8):
+    """Retrieve many registered people from Euroleague BasketBall.
+
+    See :func:`hoopster.elb.profiles`.
+    """
+    person_codes = list(person_codes)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def retrieve(code):
+        async with semaphore:
+            return await profile(code, career_history)
+
+    codes = list(dict.fromkeys(person_codes))
+    persons = await asyncio.gather(*[retrieve(c) for c in codes],
+                                   return_exceptions=True)
+    results = dict(zip(codes, persons))
+    return [results[code] for code in person_codes]
+
+
+async def all_teams(offset=0, limit=500):
+    """Retrieve all registered teams.
+
+    See :func:`hoopster.elb.all_teams`.
+    """
+    data = await _get_json('clubs', offset=offset, limit=limit)
+    return [Team.from_api(r) for r in data]
+
+
+async def team(team_code):
+    """Retrieve a team information.
+
+    See :func:`hoopster.elb.team`.
+    """
+    return Team.from_api(await _get_json('clubs', team_code))
+
+
+async def game_records(team_code, competition_code):
+    """Retrieve a team competition records per single game.
+
+    See :func:`hoopster.elb.game_records`.
+    """
+    data = await _get_json('clubs', team_code, 'competition',
+                           competition_code, 'gamerecords')
+    return [GameRecord.from_api(r) for r in data]
+
+
+async def player_highs(team_code, competition_code):
+    """Returns team competition player highs.
+
+    See :func:`hoopster.elb.player_highs`.
+    """
+    data = await _get_json('clubs', team_code, 'competition',
+                           competition_code, 'playerhighs')
+    return [GameRecord.from_api(r) for r in data]
+
+
+async def season_records(team_code, competition_code):
+    """Returns team competition season records.
+
+    See :func:`hoopster.elb.season_records`.
+    """
+    data = await _get_json('clubs', team_code, 'competition',
+                           competition_code, 'seasonrecords')
+    return [GameRecord.from_api(r) for r in data]
+
+
+async def latest_team_videos(team_code):
+    """Returns the latest team videos.
+
+    See :func:`hoopster.elb.latest_team_videos`.
+    """
+    data = await _get_json('clubs', team_code, 'videos')
+    return [Video.from_api(r) for r in data]
+
+
+async def all_competitions():
+    """Returns all available competitions.
+
+    See :func:`hoopster.elb.all_competitions`.
+    """
+    data = await _get_json('competitions')
+    return [Competition.from_api(r) for r in data]
+
+
+async def competition(competition_code):
+    """Returns a competition.
+
+    See :func:`hoopster.elb.competition`.
+    """
+    data = await _get_json('competitions', competition_code)
+    return Competition.from_api(data)
+
+
+async def all_seasons(competition_code):
+    """Returns all seasons of a competition.
+
+    See :func:`hoopster.elb.all_seasons`.
+    """
+    data = await _get_json('competitions', competition_code, 'seasons')
+    seasons = [Season.from_api(r) for r in data]
+    elb._pin_past_seasons(competition_code, seasons)
+    return seasons
+
+
+async def season(year, competition_code):
+    """Returns a competition season.
+
+    See :func:`hoopster.elb.season`.
+    """
+    season_code = f'{competition_code}{year}'
+    data = await _get_json('competitions', competition_code, 'seasons',
+                           season_code)
+    return [Season.from_api(r) for r in data]
+
+
+@tracing.traced()
+async def games(competition_code, season_code, only_played=False,
+                lazy=False):
+    """Returns all games from a competition season.
+
+    See :func:`hoopster.elb.games`.
+    """
+    data = await _get_json('competitions', competition_code, 'seasons',
+                           season_code, 'games')
+    games = elb._parse_games(data, lazy)
+    elb._pin_played_games(competition_code, season_code, games)
+    if only_played:
+        games = [g for g in games if g.played]
+    return games
+
+
+@tracing.traced()
+async def game_stats(competition_code, season_code, game_code,
+                     lazy=False):
+    """Returns the box score of a game.
+
+    See :func:`hoopster.elb.game_stats`.
+    """
+    data = await _get_json('competitions', competition_code, 'seasons',
+                           season_code, 'games', game_code, 'stats')
+    return elb._parse_game_stats(data, lazy)
+
+
+async def season_game_stats(competition_code, season_code, workers=8,
+                            progress=None):
+    """Fetch the box scores of all the played games of a season.
+
+    Asynchronous generator of ``(game, stats)`` pairs, see
+    :func:`hoopster.elb.season_game_stats`.
+    """
+    played = await games(competition_code, season_code, only_played=True)
+    semaphore = asyncio.Semaphore(workers)
+
+    async def fetch(game):
+        async with semaphore:
+            try:
+                stats = await game_stats(competition_code, season_code,
+                                         game.game_code)
+            except Exception as e:
+                stats = e
+            return game, stats
+
+    tasks = [asyncio.ensure_future(fetch(game)) for game in played]
+    try:
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            result = await task
+            if progress is not None:
+                progress(done, len(tasks))
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _pages(listing, page_size=500, prefetch=0, **kwargs):
+    """Yield in order the pages of an offset/limit listing.
+
+    See :func:`hoopster.elb._pages`.
+    """
+    if page_size < 1:
+        raise ValueError("page_size should be positive")
+    offsets = itertools.count(0, page_size)
+    window = collections.deque(
+        asyncio.ensure_future(listing(offset=next(offsets), limit=page_size,
+                                      **kwargs))
+        for _ in range(max(prefetch, 0) + 1))
+    try:
+        while window:
+            page = await window.popleft()
+            if len(page) < page_size:
+                yield page
+                return
+            window.append(asyncio.ensure_future(
+                listing(offset=next(offsets), limit=page_size, **kwargs)))
+            yield page
+    finally:
+        for task in window:
+            task.cancel()
+
+
+async def fetch_all(listing, page_size=500, workers=8, expected=None,
+                    **kwargs):
+    """Fetch every item of an offset/limit listing with parallel requests.
+
+    At most ``workers`` pages are requested at the same time, and the
+    number of simultaneous requests is also bounded by the concurrency of
+    the :class:`hoopster.aio.AsyncSession`. See
+    :func:`hoopster.elb.fetch_all`.
+    """
+    window = workers
+    if expected:
+        window = max(window, -(-expected // page_size) + 1)
+    semaphore = asyncio.Semaphore(workers)
+
+    async def bounded(**params):
+        async with semaphore:
+            return await listing(**params)
+
+    return [item async for page in _pages(bounded, page_size, window - 1,
+                                          **kwargs)
+            for item in page]
+
+
+async def iter_profiles(page_size=500, prefetch=0):
+    """Iterate over all registered people at Euroleague Basketball.
+
+    See :func:`hoopster.elb.iter_profiles`.
+    """
+    async for page in _pages(all_profile, page_size, prefetch):
+        for person in page:
+            yield person
+
+
+async def iter_referees(year=None, competition_code=None, page_size=500,
+                        prefetch=0):
+    """Iterate over all registered referees.
+
+    See :func:`hoopster.elb.iter_referees`.
+    """
+    async for page in _pages(all_referees, page_size, prefetch, year=year,
+                             competition_code=competition_code):
+        for referee in page:
+            yield referee
+
+
+async def iter_venues(page_size=500, prefetch=0):
+    """Iterate over all venues.
+
+    See :func:`hoopster.elb.iter_venues`.
+    """
+    async for page in _pages(venues, page_size, prefetch):
+        for venue in page:
+            yield venue
+
+
+async def iter_teams(page_size=500, prefetch=0):
+    """Iterate over all registered teams.
+
+    See :func:`hoopster.elb.iter_teams`.
+    """
+    async for page in _pages(all_teams, page_size, prefetch):
+        for team in page:
+            yield team
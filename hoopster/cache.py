@@ -0,0 +1,385 @@
+"""Cache of API responses.
+
+Responses to GET requests are stored with their validators (``ETag`` and
+``Last-Modified``) so they can be revalidated with a conditional request.
+A stored response is served without any request while it is fresh.
+"""
+
+import fnmatch
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from hoopster.constants import API_URLS
+
+FOREVER = float('inf')
+
+# Freshness, in seconds, of the endpoints for which the server does not
+# send caching headers. Keys are route patterns, see ``match_route``, the
+# first matching pattern wins.
+DEFAULT_FRESHNESS = {
+    'competitions/*/seasons/*/games/*/stats': 10,
+    'competitions/*/seasons/*/games/**': 60,
+    'people': 24 * 3600,
+    'people/**': 24 * 3600,
+    'clubs/*/competition/*/*': 24 * 3600,
+    'competitions': 24 * 3600,
+    'competitions/*': 24 * 3600,
+    'venues': 24 * 3600,
+    'venues/*': 24 * 3600,
+    'clubs': 24 * 3600,
+    'clubs/*': 24 * 3600,
+}
+
+
+def route(url):
+    """Return the path of ``url`` relative to the API root.
+
+    Parameters
+    ----------
+    url : str
+        full url, as returned by :func:`hoopster.client.build_url`
+
+    Returns
+    -------
+    path : str
+        path without API root nor query string, e.g. ``people/KRV``
+    """
+    url = url.split('?', 1)[0]
+    for base in API_URLS.values():
+        if url.startswith(base):
+            return url[len(base):].strip('/')
+    return urlsplit(url).path.strip('/')
+
+
+def match_route(path, pattern):
+    """Check whether a route matches a pattern.
+
+    Patterns are matched segment by segment with :func:`fnmatch.fnmatch`
+    rules, so ``*`` never crosses a ``/``. A trailing ``**`` segment
+    matches any number of segments.
+
+    Examples
+    --------
+    >>> match_route('people/KRV', 'people/*')
+    True
+    >>> match_route('people/KRV/bio', 'people/*')
+    False
+    >>> match_route('people/KRV/bio', 'people/**')
+    True
+    """
+    parts = path.split('/')
+    patterns = pattern.split('/')
+    if patterns[-1] == '**':
+        patterns = patterns[:-1]
+        parts = parts[:len(patterns)]
+    if len(parts) != len(patterns):
+        return False
+    return all(fnmatch.fnmatchcase(p, pat) for p, pat in zip(parts, patterns))
+
+
+@dataclass
+class CacheEntry:
+    """Stored response of a GET request.
+
+    Backends may return entries with the raw ``body`` only and no decoded
+    ``data``.
+    """
+
+    body: bytes = None
+    data: object = None
+    etag: str = None
+    last_modified: str = None
+    expires: float = 0.0
+
+    def is_fresh(self, now=None):
+        """Whether the entry can be served without contacting the API."""
+        return self.expires > (time.time() if now is None else now)
+
+    def validators(self):
+        """Return the headers of a conditional request for this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CachePolicy:
+    """Decide for how long a response stays fresh.
+
+    Pinned routes hold final resources, e.g. the box score of a played
+    game, and never expire. For other routes, the ``Cache-Control`` and
+    ``Expires`` headers of the response are used when present, otherwise
+    the freshness of the first rule matching the route of the url.
+
+    Parameters
+    ----------
+    rules : dict, optional
+        Mapping of route patterns (see :func:`match_route`) to a
+        freshness in seconds. Default: ``DEFAULT_FRESHNESS``.
+    """
+
+    def __init__(self, rules=None):
+        rules = DEFAULT_FRESHNESS if rules is None else rules
+        self._rules = list(rules.items())
+        self._pinned = set()
+        self._pinned_patterns = []
+        self._lock = threading.Lock()
+
+    @property
+    def rules(self):
+        return dict(self._rules)
+
+    def set(self, pattern, seconds):
+        """Set the freshness of the routes matching ``pattern``.
+
+        The new rule takes precedence over the existing ones.
+        """
+        with self._lock:
+            rules = [r for r in self._rules if r[0] != pattern]
+            self._rules = [(pattern, seconds)] + rules
+
+    def remove(self, pattern):
+        """Remove the rule of ``pattern``."""
+        with self._lock:
+            self._rules = [r for r in self._rules if r[0] != pattern]
+
+    def pin(self, pattern):
+        """Mark the routes matching ``pattern`` as final.
+
+        Their responses are stored forever, whatever the API headers, and
+        served without revalidation.
+
+        Parameters
+        ----------
+        pattern : str
+            route or route pattern, e.g. ``'competitions/E/seasons/E2019/**'``
+        """
+        with self._lock:
+            if _is_pattern(pattern):
+                if pattern not in self._pinned_patterns:
+                    self._pinned_patterns = self._pinned_patterns + [pattern]
+            else:
+                self._pinned.add(pattern)
+
+    def unpin(self, pattern):
+        """Remove a route or route pattern given to :meth:`pin`."""
+        with self._lock:
+            self._pinned.discard(pattern)
+            self._pinned_patterns = [p for p in self._pinned_patterns
+                                     if p != pattern]
+
+    def is_pinned(self, url):
+        """Whether the response of ``url`` is final."""
+        path = route(url)
+        if path in self._pinned:
+            return True
+        return any(match_route(path, p) for p in self._pinned_patterns)
+
+    def lookup(self, url):
+        """Return the freshness of ``url`` defined by the rules, or None."""
+        path = route(url)
+        for pattern, seconds in self._rules:
+            if match_route(path, pattern):
+                return seconds
+        return None
+
+    def expires(self, url, headers, now=None):
+        """Return the expiration time of a response.
+
+        Returns
+        -------
+        expires : float or None
+            epoch time after which the response must be revalidated. None
+            if the response must not be stored.
+        """
+        now = time.time() if now is None else now
+        if self.is_pinned(url):
+            return FOREVER
+        directives = _cache_control(headers.get('Cache-Control', ''))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return now
+        if 'max-age' in directives:
+            try:
+                return now + int(directives['max-age'])
+            except ValueError:
+                return now
+        if headers.get('Expires'):
+            try:
+                return parsedate_to_datetime(headers['Expires']).timestamp()
+            except (TypeError, ValueError):
+                return now
+        seconds = self.lookup(url)
+        return now if seconds is None else now + seconds
+
+
+def _is_pattern(path):
+    return any(c in path for c in '*?[')
+
+
+def _cache_control(value):
+    directives = {}
+    for item in value.split(','):
+        key, _, arg = item.strip().partition('=')
+        if key:
+            directives[key.lower()] = arg.strip('"')
+    return directives
+
+
+class MemoryCache:
+    """Thread-safe in-memory LRU cache of decoded responses.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of stored responses.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        # decoded data is kept, the raw body is not needed anymore
+        entry = replace(entry, body=None)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class SQLiteCache:
+    """Persistent cache of responses stored in a SQLite database.
+
+    Responses are keyed by their url, as built by
+    :func:`hoopster.client.build_url`, and their body is stored compressed.
+    The database is opened in WAL mode so several processes of the same
+    host can read and write it concurrently. Entries are returned with
+    their raw body only, the client decodes it.
+
+    Parameters
+    ----------
+    path : str
+        path of the database file, created if needed
+    timeout : float, optional
+        How long to wait for a lock held by another process, in seconds.
+    level : int, optional
+        zlib compression level of the stored bodies.
+
+    Examples
+    --------
+    >>> client.set_cache(SQLiteCache('hoopster.sqlite'))  # doctest: +SKIP
+    """
+
+    def __init__(self, path, timeout=30.0, level=6):
+        self.path = os.path.expanduser(path)
+        self.timeout = timeout
+        self.level = level
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, body BLOB, etag TEXT, '
+            'last_modified TEXT, expires REAL, stored REAL)')
+
+    def _connect(self):
+        # one connection per thread and per process, sqlite connections
+        # cannot be shared across a fork
+        con = getattr(self._local, 'con', None)
+        if con is None or self._local.pid != os.getpid():
+            con = sqlite3.connect(self.path, timeout=self.timeout,
+                                  isolation_level=None,
+                                  check_same_thread=False)
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            self._local.con = con
+            self._local.pid = os.getpid()
+        return con
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT body, etag, last_modified, expires FROM responses '
+            'WHERE url = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        body = zlib.decompress(row[0])
+        # decoded by the client with its own decoder
+        return CacheEntry(body=body, etag=row[1], last_modified=row[2],
+                          expires=row[3])
+
+    def set(self, key, entry):
+        body = entry.body
+        if body is None:
+            body = json.dumps(entry.data).encode('utf-8')
+        self._connect().execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+            (key, zlib.compress(body, self.level), entry.etag,
+             entry.last_modified, entry.expires, time.time()))
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM responses WHERE url = ?',
+                                (key, ))
+
+    def clear(self):
+        self._connect().execute('DELETE FROM responses')
+
+    def prune(self, older_than=30 * 24 * 3600):
+        """Remove the expired responses stored more than ``older_than``
+        seconds ago.
+
+        Expired responses are kept by default since they can still be
+        revalidated.
+        """
+        now = time.time()
+        self._connect().execute(
+            'DELETE FROM responses WHERE expires < ? AND stored < ?',
+            (now, now - older_than))
+
+    def close(self):
+        """Close the connection of the calling thread."""
+        con = getattr(self._local, 'con', None)
+        if con is not None:
+            con.close()
+            self._local.con = None
+
+    def __len__(self):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def __contains__(self, key):
+        return self._connect().execute(
+            'SELECT 1 FROM responses WHERE url = ?', (key, )).fetchone() \
+            is not None
@@ -1,8 +1,344 @@
 """Utility function for calling the API."""
 
+import contextvars
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+
 import requests
 from urllib.parse import urlencode, urljoin
+import hoopster.tracing as tracing
+import hoopster.utils as utils
+from hoopster.cache import (FOREVER, CacheEntry, CachePolicy, MemoryCache,
+                            route)
 from hoopster.constants import API_URLS, VALID_REQUEST_METHODS
+from hoopster.ratelimit import RateLimiter
+from hoopster.retry import Attempt, RetryPolicy
+from hoopster.singleflight import SingleFlight
+from hoopster.transport import Session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the session shared by all API calls, creating it if needed."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = Session()
+    return _session
+
+
+def set_session(session):
+    """Replace the session shared by all API calls.
+
+    Parameters
+    ----------
+    session : Transport or None
+        New shared session, any :class:`hoopster.transport.Transport`
+        works, e.g. a :class:`hoopster.transport.ReplayTransport`. None
+        restores a default one on next use.
+
+    Returns
+    -------
+    previous : Session or None
+        The session that was in use. It is not closed.
+    """
+    global _session
+    with _session_lock:
+        previous, _session = _session, session
+    return previous
+
+
+def configure_session(**kwargs):
+    """Replace the shared session by a new one built with ``kwargs``.
+
+    The previous shared session is closed. See :class:`Session` for the
+    available parameters.
+    """
+    previous = set_session(Session(**kwargs))
+    if previous is not None:
+        previous.close()
+    return get_session()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_pool_thread = threading.local()
+MAX_WORKERS = 8
+
+
+def _mark_pool_thread():
+    _pool_thread.active = True
+
+
+def get_executor():
+    """Return the thread pool running concurrent API calls.
+
+    Its size is ``MAX_WORKERS``, read when the pool is created.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix='hoopster',
+                    initializer=_mark_pool_thread)
+    return _executor
+
+
+def submit(fn, *args, **kwargs):
+    """Run ``fn(*args, **kwargs)`` in the shared thread pool.
+
+    The call runs in a copy of the current context, so it sees the context
+    variables, like the tracing span, of the caller. Called from a thread
+    of the pool itself, it runs ``fn`` right away in that thread: waiting
+    there for a call queued behind the busy threads could deadlock.
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+    """
+    if getattr(_pool_thread, 'active', False):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+    return submit_to(get_executor(), fn, *args, **kwargs)
+
+
+def submit_to(executor, fn, *args, **kwargs):
+    """Run ``fn(*args, **kwargs)`` in ``executor``, in a copy of the
+    current context like :func:`submit`.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor
+        e.g. a pool dedicated to a bulk download
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+    """
+    context = contextvars.copy_context()
+    return executor.submit(context.run, fn, *args, **kwargs)
+
+
+def close():
+    """Close the connections of the shared session and stop the shared
+    thread pool."""
+    global _executor
+    previous = set_session(None)
+    if previous is not None:
+        previous.close()
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _default_decoder():
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+_decoder = _default_decoder()
+
+
+def get_decoder():
+    """Return the function decoding the JSON responses."""
+    return _decoder
+
+
+def set_decoder(decoder):
+    """Replace the function decoding the JSON responses.
+
+    By default, orjson is used when it is installed, otherwise the
+    standard library json module. Streamed responses, see
+    :func:`iter_json`, are always decoded by the json module, which finds
+    the elements and decodes them in a single pass.
+
+    Parameters
+    ----------
+    decoder : callable or None
+        Function taking the raw body, as bytes, and returning the decoded
+        content. None restores the default decoder.
+
+    Returns
+    -------
+    previous : callable
+        The decoder that was in use.
+    """
+    global _decoder
+    previous = _decoder
+    _decoder = decoder or _default_decoder()
+    return previous
+
+
+_cache = MemoryCache()
+_cache_policy = CachePolicy()
+_retry_policy = RetryPolicy()
+_rate_limiter = RateLimiter()
+_flights = SingleFlight()
+_metrics = None
+
+
+def get_rate_limiter():
+    """Return the :class:`hoopster.ratelimit.RateLimiter` of all requests."""
+    return _rate_limiter
+
+
+def set_rate_limit(rate, burst=None, prefix=None):
+    """Limit the rate of the requests sent to the API.
+
+    Requests over the limit wait for their turn, in arrival order, in
+    threads and event loops alike.
+
+    Parameters
+    ----------
+    rate : float or None
+        Number of requests per second. None removes the limit.
+    burst : int, optional
+        Number of requests that can be sent at once after an idle period.
+    prefix : str, optional
+        Only limit the requests to this route prefix or pattern, e.g.
+        ``'people'`` or ``'competitions/*/seasons/*/games'``.
+
+    """
+    _rate_limiter.set_limit(rate, burst=burst, prefix=prefix)
+
+
+def get_retry_policy():
+    """Return the :class:`hoopster.retry.RetryPolicy` in use."""
+    return _retry_policy
+
+
+def set_retry_policy(policy):
+    """Replace the retry policy shared by all API calls.
+
+    Parameters
+    ----------
+    policy : RetryPolicy or None
+        New policy. None disables retries.
+
+    Returns
+    -------
+    previous : RetryPolicy
+        The policy that was in use.
+    """
+    global _retry_policy
+    previous = _retry_policy
+    _retry_policy = policy or RetryPolicy(total=1)
+    return previous
+
+
+def get_metrics():
+    """Return the :class:`hoopster.metrics.Metrics` recording the requests,
+    or None when they are not recorded."""
+    return _metrics
+
+
+def set_metrics(metrics):
+    """Record the requests, cache lookups and decoding in ``metrics``.
+
+    Parameters
+    ----------
+    metrics : Metrics or None
+        New registry, see :class:`hoopster.metrics.Metrics`. None stops
+        recording.
+
+    Returns
+    -------
+    previous : Metrics or None
+        The registry that was in use.
+    """
+    global _metrics
+    previous = _metrics
+    _metrics = metrics
+    return previous
+
+
+def get_cache():
+    """Return the cache used by :func:`get_json`, or None if disabled."""
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the cache used by :func:`get_json`.
+
+    Parameters
+    ----------
+    cache : object or None
+        Any object with the ``get``/``set``/``delete`` interface of
+        :class:`hoopster.cache.MemoryCache`. None disables caching.
+
+    Returns
+    -------
+    previous : object or None
+        The cache that was in use.
+    """
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+
+def get_cache_policy():
+    """Return the :class:`hoopster.cache.CachePolicy` in use."""
+    return _cache_policy
+
+
+def set_cache_policy(policy):
+    """Replace the :class:`hoopster.cache.CachePolicy` in use.
+
+    Returns
+    -------
+    previous : CachePolicy
+        The policy that was in use.
+    """
+    global _cache_policy
+    previous, _cache_policy = _cache_policy, policy
+    return previous
+
+
+def set_freshness(pattern, seconds):
+    """Set how long responses of a route stay fresh.
+
+    Only used when the API does not send ``Cache-Control`` or ``Expires``
+    headers.
+
+    Parameters
+    ----------
+    pattern : str
+        route pattern relative to the API root, e.g. ``'people/*'``
+    seconds : float
+        freshness of the matching responses
+
+    """
+    _cache_policy.set(pattern, seconds)
+
+
+def pin(*urls):
+    """Mark the responses of ``urls`` as final, see
+    :meth:`hoopster.cache.CachePolicy.pin`.
+
+    Parameters
+    ----------
+    urls : str
+        urls as built by :func:`build_url`, or route patterns relative to
+        the API root
+    """
+    for url in urls:
+        _cache_policy.pin(route(url))
 
 
 def build_url(*path, **queryparams):
@@ -28,10 +364,34 @@ def build_url(*path, **queryparams):
     return url
 
 
+class HTTPError(IOError):
+    """The API answered with an error status.
+
+    Attributes
+    ----------
+    response : Response
+        the response of the API
+    """
+
+    def __init__(self, response):
+        super().__init__(response)
+        self.response = response
+
+    def __str__(self):
+        res = self.response
+        return '{} error for url {}: {}'.format(res.status_code, res.url,
+                                                res.text[:200])
+
+
 def make_request(url, method, headers=None, data=None,
-                 timeout=None, hooks=None):
+                 timeout=None, hooks=None, session=None, retry=None,
+                 stream=False):
     """Make the request to the API.
 
+    Transient failures (connection errors, timeouts and the status codes of
+    the retry policy) of idempotent requests are retried, see
+    :class:`hoopster.retry.RetryPolicy`.
+
     Parameters
     ----------
     url : str
@@ -43,36 +403,99 @@ def make_request(url, method, headers=None, data=None,
     timeout : int, optional
         How long to wait for the server to send data before giving up
     hooks : dict, optional
+        requests event hooks. The callables of the extra ``'attempt'``
+        event receive a :class:`hoopster.retry.Attempt` after each attempt.
+    session : Transport, optional
+        Session used to send the request. Default: the shared session.
+    retry : RetryPolicy, optional
+        Retry policy of the request. Default: the shared policy, see
+        :func:`set_retry_policy`.
+    stream : bool, optional
+        If True, the body is not downloaded until it is read, e.g. with
+        ``response.iter_content()``.
 
     Returns
     -------
     response :
         response value
+
+    Raises
+    ------
+    HTTPError
+        if the API answers with an error status
     """
     if method not in VALID_REQUEST_METHODS:
         raise ValueError("Incorrect request method. method should be "
                          "{}".format(VALID_REQUEST_METHODS))
 
-    hooks = hooks or requests.hooks.default_hooks()
-    headers = headers or requests.utils.default_headers()
-    try:
-        response = requests.request(**dict(method=method,
-                                           url=url,
-                                           json=data,
-                                           timeout=timeout,
-                                           hooks=hooks,
-                                           headers=headers
-                                           ))
-    except requests.exceptions.RequestException as e:
-        raise e
+    hooks = dict(hooks or requests.hooks.default_hooks())
+    attempt_hooks = _as_list(hooks.pop('attempt', []))
+    session = session or get_session()
+    retry = retry or _retry_policy
+    with tracing.span('fetch', method=method, url=url) as span:
+        number = 0
+        first = time.perf_counter()
+        while True:
+            number += 1
+            response = error = None
+            _rate_limiter.acquire(url)
+            start = time.perf_counter()
+            try:
+                response = session.request(**dict(method=method,
+                                                  url=url,
+                                                  json=data,
+                                                  timeout=timeout,
+                                                  hooks=hooks,
+                                                  headers=headers,
+                                                  stream=stream
+                                                  ))
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            delay = retry.delay(method, number, response, error)
+            if attempt_hooks:
+                attempt = Attempt(method, url, number, elapsed,
+                                  getattr(response, 'status_code', None),
+                                  error, delay)
+                for hook in attempt_hooks:
+                    hook(attempt)
+            if delay is None:
+                break
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+        span.set(attempts=number,
+                 status_code=getattr(response, 'status_code', None))
+
+    if _metrics is not None:
+        _record_request(_metrics, url, response, error,
+                        time.perf_counter() - first, number, stream)
+    if error is not None:
+        raise error
+    if response.status_code >= 400:
+        raise HTTPError(response)
+
+    if response.status_code == 204:
+        return None
+    return response
+
+
+def _record_request(metrics, url, response, error, elapsed, attempts,
+                    stream=False):
+    if error is not None:
+        status, size = type(error).__name__, 0
+    elif stream:
+        status = response.status_code
+        size = int(response.headers.get('Content-Length') or 0)
     else:
-        if response.status_code >= 400:
-            print(response.text)
-            raise IOError(response)
+        status, size = response.status_code, len(response.content)
+    metrics.record_request(url, status, elapsed, size, attempts - 1)
+
 
-        if response.status_code == 204:
-            return None
-        return response
+def _as_list(hooks):
+    return [hooks] if callable(hooks) else list(hooks)
 
 
 def post(url, body=None, **kwargs):
@@ -118,6 +541,163 @@ def get(url, params=None, **kwargs):
     return make_request(url=url, method='GET', **kwargs)
 
 
+def get_json(url, params=None, **kwargs):
+    """Handle GET requests and return the decoded JSON content.
+
+    The response goes through the cache (see :func:`set_cache`). A fresh
+    cached response is returned without contacting the API. A stale one is
+    revalidated with ``If-None-Match``/``If-Modified-Since`` and, when the
+    API answers ``304 Not Modified``, served without decoding anything.
+
+    Concurrent calls for the same url share a single request and decoding.
+    The returned content may be shared with other callers and must not be
+    modified.
+
+    Parameters
+    ----------
+    url: str
+        The url for the endpoint including path parameters
+    params: dict, optional
+        The query string parameters
+
+    Returns
+    -------
+    content : dict or list
+        The JSON output from the API
+    """
+    if params:
+        url += '?' + urlencode(params)
+    entry = _cache_lookup(url)
+    now = time.time()
+    if entry is not None and entry.is_fresh(now):
+        if _metrics is not None:
+            _metrics.record_cache(url, 'hit')
+        return entry.data
+    return _flights.do(url, _fetch_json, url, entry, now, **kwargs)
+
+
+def iter_json(url, params=None, chunk_size=64 * 1024, **kwargs):
+    """Handle GET requests of JSON arrays and decode them incrementally.
+
+    The elements are decoded while the body is downloaded, so neither the
+    whole body nor the whole decoded array is held in memory. A fresh
+    cached response is used when available, but streamed responses are not
+    stored in the cache.
+
+    Parameters
+    ----------
+    url: str
+        The url for the endpoint including path parameters
+    params: dict, optional
+        The query string parameters
+    chunk_size: int, optional
+        Number of bytes read at once
+
+    Yields
+    ------
+    element :
+        decoded element of the JSON array
+    """
+    if params:
+        url += '?' + urlencode(params)
+    entry = _cache_lookup(url)
+    if entry is not None and entry.is_fresh():
+        if _metrics is not None:
+            _metrics.record_cache(url, 'hit')
+        yield from entry.data
+        return
+    if _metrics is not None:
+        _metrics.record_cache(url, 'miss')
+
+    response = make_request(url=url, method='GET', stream=True, **kwargs)
+    if response is None:
+        return
+    with response:
+        yield from utils.iter_json_array(
+            response.iter_content(chunk_size=chunk_size))
+
+
+def cached_json(url, params=None):
+    """Return the decoded content of ``url`` if it is fresh in the cache,
+    otherwise None, without sending any request.
+
+    Like with :func:`get_json`, the content may be shared and must not be
+    modified.
+    """
+    if params:
+        url += '?' + urlencode(params)
+    entry = _cache_lookup(url)
+    if entry is not None and entry.is_fresh():
+        return entry.data
+    return None
+
+
+def _fetch_json(url, entry, now, headers=None, **kwargs):
+    headers = dict(headers or {})
+    if entry is not None:
+        headers.update(entry.validators())
+    response = make_request(url=url, method='GET', headers=headers or None,
+                            **kwargs)
+    return _cache_response(url, response, entry, now)
+
+
+def _cache_lookup(url):
+    """Return the cached entry of ``url``.
+
+    An entry stored before its route was pinned may hold a state of the
+    resource older than the final one, e.g. the box score of a game still
+    being played: it is returned as stale, to be revalidated once, and the
+    answer is then stored forever.
+    """
+    cache = _cache
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None and entry.data is None and entry.body is not None:
+        entry = replace(entry, data=_decode(url, entry.body))
+    if entry is not None and entry.expires != FOREVER \
+            and _cache_policy.is_pinned(url):
+        entry = replace(entry, expires=0.0)
+    return entry
+
+
+def _decode(url, body):
+    with tracing.span('decode', url=url, size=len(body)):
+        if _metrics is None:
+            return _decoder(body)
+        start = time.perf_counter()
+        data = _decoder(body)
+        _metrics.record_decode(url, time.perf_counter() - start)
+        return data
+
+
+def _cache_response(url, response, entry, now):
+    """Store ``response`` in the cache and return its decoded content.
+
+    ``entry`` is the stale cached entry the request was conditioned on.
+    """
+    if response is None:
+        return None
+    cache = _cache
+    expires = _cache_policy.expires(url, response.headers, now)
+    if response.status_code == 304 and entry is not None:
+        if _metrics is not None:
+            _metrics.record_cache(url, 'revalidated')
+        if cache is not None and expires is not None:
+            cache.set(url, replace(entry, expires=expires))
+        return entry.data
+
+    if _metrics is not None:
+        _metrics.record_cache(url, 'miss')
+    data = _decode(url, response.content)
+    if cache is not None and expires is not None:
+        entry = CacheEntry(body=response.content, data=data,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'),
+                           expires=expires)
+        if entry.validators() or entry.is_fresh(now):
+            cache.set(url, entry)
+    return data
+
+
 def delete(url, **kwargs):
     """Handle DELETE requests to Remove information.
 
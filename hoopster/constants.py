@@ -1,6 +1,8 @@
 """ """
 
 VALID_REQUEST_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+IDEMPOTENT_REQUEST_METHODS = ['GET', 'PUT', 'DELETE']
+RETRY_STATUS_CODES = [429, 502, 503, 504]
 API_V1_URL = "https://www.euroleague.net/euroleague/api/"
 API_V2_URL = "https://api.euroleague.net/api/v2.0/"
 API_URLS = {1.0: API_V1_URL, 2.0: API_V2_URL}
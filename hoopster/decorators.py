@@ -1,36 +1,346 @@
 
-from dataclasses import dataclass, is_dataclass
+import functools
+import threading
+from dataclasses import MISSING as MISSING_FIELD
+from dataclasses import (FrozenInstanceError, dataclass, fields,
+                         is_dataclass)
 from typing import get_args
 
+import hoopster.identity as identity
+from hoopster.utils import snake_to_camel
+
+
+def _nested_converter(ft):
+    """Return the function converting the raw value of a field of type
+    ``ft`` into dataclasses, or None if there is nothing to convert."""
+    if is_dataclass(ft):
+        def convert(value):
+            return ft(**value) if isinstance(value, dict) else value
+        return convert
+    # manage genericalias
+    if getattr(ft, '__origin__', None) is list:
+        sub_ft = (get_args(ft) or [None])[0]
+        if is_dataclass(sub_ft):
+            def convert(value):
+                if not isinstance(value, list):
+                    return value
+                return [sub_ft(**v) if isinstance(v, dict) else v
+                        for v in value]
+            return convert
+    return None
+
 
 # decorator to wrap original __init__
 def nested_dataclass(*args, **kwargs):
+    """Make a dataclass whose dataclass fields, or lists of dataclasses,
+    can be given as dicts, or lists of dicts, of keyword arguments.
+
+    The fields to convert are found once, when the class is created. The
+    class also gets a ``from_api(raw)`` constructor, see
+    :func:`make_from_api`.
+
+    Besides the arguments of :func:`dataclasses.dataclass`, ``slots=True``
+    stores the fields in ``__slots__`` instead of an instance ``__dict__``,
+    on every Python version, and ``intern=True`` lets an identity map
+    share the equal objects built by ``from_api``, see
+    :mod:`hoopster.identity`.
+    """
+    slots = kwargs.pop('slots', False)
+    intern = kwargs.pop('intern', False)
 
     def wrapper(check_class):
         # passing class to investigate
         check_class = dataclass(check_class, **kwargs)
+        if slots:
+            check_class = _add_slots(check_class)
         o_init = check_class.__init__
+        plan = []
+        for f in fields(check_class):
+            convert = _nested_converter(f.type)
+            if convert is not None:
+                plan.append((f.name, convert))
+        plan = tuple(plan)
 
+        @functools.wraps(o_init)
         def __init__(self, *args, **kwargs):
+            for name, convert in plan:
+                value = kwargs.get(name)
+                if value is not None:
+                    kwargs[name] = convert(value)
+            o_init(self, *args, **kwargs)
 
-            for name, value in kwargs.items():
-
-                # getting field type
-                ft = check_class.__annotations__.get(name, None)
-
-                if is_dataclass(ft) and isinstance(value, dict):
-                    obj = ft(**value)
-                    kwargs[name] = obj
-                # manage genericalias
-                elif '__origin__' in dir(ft):
-                    if ft.__origin__ == list:
-                        sub_ft = get_args(ft)[0]
-                        if is_dataclass(sub_ft):
-                            kwargs[name] = [sub_ft(**v) for v in value]
-
-                o_init(self, *args, **kwargs)
         check_class.__init__ = __init__
+        if '__eq__' in check_class.__dict__:
+            check_class.__eq__ = _identity_eq(check_class.__eq__)
+        check_class.from_api = classmethod(
+            make_from_api(check_class, intern))
 
         return check_class
 
     return wrapper(args[0]) if args else wrapper
+
+
+def _identity_eq(o_eq):
+    """Wrap ``__eq__`` to compare an object to itself without looking at
+    its fields, e.g. models shared by an identity map."""
+    @functools.wraps(o_eq)
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return o_eq(self, other)
+    return __eq__
+
+
+def _add_slots(cls):
+    """Rebuild the dataclass ``cls`` with its fields in ``__slots__``."""
+    names = tuple(f.name for f in fields(cls))
+    inherited = set()
+    for base in cls.__mro__[1:-1]:
+        inherited.update(getattr(base, '__slots__', ()))
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = tuple(n for n in names if n not in inherited)
+    # the defaults are kept by the fields, and would shadow the slots
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    # frozen instances are unpickled without __setattr__
+    namespace['__getstate__'] = _getstate
+    namespace['__setstate__'] = _setstate
+    if cls.__dataclass_params__.frozen:
+        # the generated ones refer to the class being replaced
+        namespace['__setattr__'] = _frozen_setattr
+        namespace['__delattr__'] = _frozen_delattr
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError('cannot assign to field {!r}'.format(name))
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError('cannot delete field {!r}'.format(name))
+
+
+def _getstate(self):
+    return [getattr(self, f.name) for f in fields(self)]
+
+
+def _setstate(self, state):
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)
+
+
+class _Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+def make_from_api(cls, intern=False, lazy=False):
+    """Generate the function building a ``cls`` object from an API
+    payload.
+
+    The value of a field is read from its camelCase API key, or from the
+    ``'api'`` key of its metadata, falling back to the field name itself.
+    Nested dataclasses, and lists of them, are built from their payloads
+    the same way. Unknown keys are ignored.
+
+    The function sets the fields directly, without calling ``__init__``.
+    With ``intern``, while an identity map is in use, see
+    :mod:`hoopster.identity`, it returns the object already built from an
+    equal payload, if any.
+
+    With ``lazy``, the nested dataclasses, and lists of them, are given as
+    :class:`Deferred` values building :func:`lazy_dataclass` objects, for
+    a ``cls`` accepting them.
+    """
+    namespace = {'MISSING': MISSING, '__new__': object.__new__,
+                 '__setattr__': object.__setattr__,
+                 'identity_map': identity.current, 'C': cls,
+                 'Deferred': Deferred}
+    lines = ['def from_api(cls, raw):']
+    if intern:
+        # subclasses, like the lazy ones, are not interned
+        lines += ['    interned = identity_map() if cls is C else None',
+                  '    if interned is not None:',
+                  '        key, self = interned.lookup(cls, raw)',
+                  '        if self is not None:',
+                  '            return self']
+    lines += ['    get = raw.get',
+              '    self = __new__(cls)']
+    for i, f in enumerate(fields(cls)):
+        keys = list(dict.fromkeys([f.metadata.get('api') or
+                                   snake_to_camel(f.name), f.name]))
+        default = 'MISSING'
+        if f.default is not MISSING_FIELD:
+            default = 'd{}'.format(i)
+            namespace[default] = f.default
+
+        for n, key in enumerate(keys):
+            last = n == len(keys) - 1
+            indent = '    ' * (n + 1)
+            lines.append('{}value = get({!r}, {})'.format(
+                indent, key, default if last else 'MISSING'))
+            if not last:
+                lines.append(indent + 'if value is MISSING:')
+        if f.default is MISSING_FIELD:
+            lines.append('    if value is MISSING:')
+            if f.default_factory is not MISSING_FIELD:
+                namespace['f{}'.format(i)] = f.default_factory
+                lines.append('        value = f{}()'.format(i))
+            else:
+                lines.append('        raise TypeError("{}.from_api() missing '
+                             'field {!r}")'.format(cls.__name__, f.name))
+
+        ft, container = f.type, None
+        if getattr(ft, '__origin__', None) is list:
+            ft, container = (get_args(ft) or [None])[0], list
+        if is_dataclass(ft):
+            build = getattr(ft, 'from_api', None)
+            if build is None:
+                def build(value, ft=ft):
+                    return ft(**value)
+            elif lazy:
+                build = functools.partial(_lazy_from_api, ft)
+            namespace['b{}'.format(i)] = build
+            if lazy:
+                if container is list:
+                    build = functools.partial(_build_list, build)
+                    lines.append('    if value.__class__ is list:')
+                else:
+                    lines.append('    if value.__class__ is dict:')
+                namespace['l{}'.format(i)] = build
+                lines.append('        value = Deferred(l{}, value)'.format(i))
+            elif container is list:
+                lines.append('    if value.__class__ is list:')
+                lines.append('        value = [b{0}(v) if v.__class__ is dict '
+                             'else v for v in value]'.format(i))
+            else:
+                lines.append('    if value.__class__ is dict:')
+                lines.append('        value = b{}(value)'.format(i))
+        lines.append('    __setattr__(self, {!r}, value)'.format(f.name))
+
+    if hasattr(cls, '__post_init__'):
+        lines.append('    self.__post_init__()')
+    if intern:
+        lines.append('    if interned is not None:')
+        lines.append('        return interned.add(key, self)')
+    lines.append('    return self')
+    exec('\n'.join(lines), namespace)
+    from_api = namespace['from_api']
+    from_api.__qualname__ = '{}.from_api'.format(cls.__qualname__)
+    from_api.__doc__ = """Build a {} from its API payload.""".format(
+        cls.__name__)
+    return from_api
+
+
+class Deferred:
+    """Value computed by ``fn(*args)`` the first time it is needed.
+
+    The value is computed once, even when threads ask for it at the same
+    time. A failed computation is attempted again on the next access.
+    """
+
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+        self._lock = threading.Lock()
+        self._resolved = False
+        self._value = None
+
+    def resolve(self):
+        if not self._resolved:
+            with self._lock:
+                if not self._resolved:
+                    self._value = self._fn(*self._args)
+                    self._resolved = True
+                    self._fn = self._args = None
+        return self._value
+
+    def __repr__(self):
+        return '<Deferred {}>'.format(
+            repr(self._value) if self._resolved else 'pending')
+
+
+class _LazyField:
+    """Data descriptor resolving a :class:`Deferred` field on access."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name]
+        if isinstance(value, Deferred):
+            value = value.resolve()
+            obj.__dict__[self.name] = value
+        return value
+
+    def __set__(self, obj, value):
+        # dataclass __init__ of frozen classes sets fields with
+        # object.__setattr__, which ends up here
+        obj.__dict__[self.name] = value
+
+
+_lazy_classes = {}
+
+
+def lazy_dataclass(cls):
+    """Return the subclass of the dataclass ``cls`` accepting
+    :class:`Deferred` field values, resolved when first accessed.
+
+    The subclass has the name of ``cls`` and its instances are instances
+    of ``cls``, equal to the plain ones with the same fields. Comparing,
+    hashing, printing or pickling them resolves every field; they are
+    unpickled as plain ``cls`` instances.
+
+    Its ``from_api`` keeps the payloads of the nested dataclasses, and
+    builds them, as lazy objects too, when their field is first accessed.
+    """
+    lazy_cls = _lazy_classes.get(cls)
+    if lazy_cls is None:
+        namespace = {f.name: _LazyField(f.name) for f in fields(cls)}
+        namespace.update(__module__=cls.__module__,
+                         __qualname__=cls.__qualname__,
+                         __reduce__=_reduce_resolved,
+                         __eq__=_lazy_eq, __hash__=cls.__hash__,
+                         from_api=classmethod(make_from_api(cls, lazy=True)))
+        lazy_cls = _lazy_classes.setdefault(
+            cls, type(cls.__name__, (cls,), namespace))
+    return lazy_cls
+
+
+def _lazy_eq(self, other):
+    # equal to the plain instances of the dataclass too
+    if self is other:
+        return True
+    base = type(self).__mro__[1]
+    if other.__class__ is not base and other.__class__ is not type(self):
+        return NotImplemented
+    return all(getattr(self, f.name) == getattr(other, f.name)
+               for f in fields(base) if f.compare)
+
+
+def _lazy_from_api(cls, raw):
+    return lazy_dataclass(cls).from_api(raw)
+
+
+def _build_list(build, raw):
+    return [build(v) if v.__class__ is dict else v for v in raw]
+
+
+def _reduce_resolved(self):
+    # pickle as the plain dataclass, with the Deferred values resolved
+    base = type(self).__mro__[1]
+    return _rebuild, (base, {f.name: getattr(self, f.name)
+                             for f in fields(self)})
+
+
+def _rebuild(cls, kwargs):
+    return cls(**kwargs)
@@ -1,13 +1,18 @@
+import collections
+import functools
+import itertools
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import hoopster.client as client
+import hoopster.tracing as tracing
 import hoopster.utils as utils
 import hoopster.decorators as dec
 from lxml import etree
-from dataclasses import dataclass
+from dataclasses import field
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Venue:
     code: str
     name: str = None
@@ -18,7 +23,7 @@ class Venue:
     notes: str = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Country:
     """Object for defining a country."""
 
@@ -26,7 +31,7 @@ class Country:
     name: str = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Competition:
     """Object for defining a competition."""
 
@@ -34,22 +39,22 @@ class Competition:
     name: str = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Coach:
     """Object for defining a coach."""
 
     code: str
     name: str = None
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class Bio:
     """Object for defining a person bio."""
 
-    summary: str = None
-    highlights: str = None
+    summary: str = field(default=None, metadata={'api': 'career'})
+    highlights: str = field(default=None, metadata={'api': 'misc'})
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Referee:
     """Object for defining a referee."""
 
@@ -68,7 +73,7 @@ class Referee:
     #         self.country = Country(code=self.nationality)
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Person:
     """Object for defining a person."""
 
@@ -88,9 +93,10 @@ class Person:
     twitter_account: str = None
     images: dict = None
     bio: Bio = None
+    career_history: list = None
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Team:
     """Object for defining a team."""
 
@@ -114,7 +120,7 @@ class Team:
     images: dict = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class GameRecord:
     category_code: str
     category_name: str = None
@@ -127,14 +133,14 @@ class GameRecord:
     season_year: int = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class Video:
     code: str = None
     provider: str = None
     title: str = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Season:
     name: str = None
     code: str = None
@@ -143,7 +149,7 @@ class Season:
     year: int = None
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class PlayerSeason:
     person: Person = None
     type: str = None
@@ -160,7 +166,7 @@ class PlayerSeason:
     club: Team = None
     season: Season = None
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class Group:
     id: int = None
     order: int = None
@@ -168,7 +174,7 @@ class Group:
     raw_name: str = None
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True, intern=True)
 class PhaseType:
     code: str = None
     alias: str = None
@@ -176,13 +182,13 @@ class PhaseType:
     is_group_phase: bool = True
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class GameTeam:
-    team: Team = None
+    team: Team = field(default=None, metadata={'api': 'club'})
     score: int = None
     standings_score: int = None
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class Game:
     game_code: int = None
     season: Season = None
@@ -202,7 +208,7 @@ class Game:
     road: GameTeam = None
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class Stats:
     time_played: int = None
     valuation: int = None
@@ -249,27 +255,27 @@ class Stats:
         return 100*self.turnovers/(self.field_goals_attempted_total+0.44*self.free_throws_attempted+self.assistances+self.turnovers)
 
 
-@dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class PlayerStats(Stats):
     dorsal: str = None
     start_five: bool = True
     start_five2: bool = True
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class GamePlayerStats:
     player: PlayerSeason = None
     stats: PlayerStats = None
 
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class GameTeamStats:
     coach: Coach = None
     players: list[GamePlayerStats] = None
     team: Stats = None
     total: Stats = None
 
-@dec.nested_dataclass(frozen=True)
+@dec.nested_dataclass(frozen=True, slots=True)
 class GameStats:
     local: GameTeamStats = None
     road: GameTeamStats = None
@@ -294,7 +300,12 @@ def referees_1():
     # print(res)
 
 
-def all_referees(year=None, offset=0, limit=500, competition_code=None):
+def _get_list(url, stream=False):
+    return client.iter_json(url) if stream else client.get_json(url)
+
+
+def all_referees(year=None, offset=0, limit=500, competition_code=None,
+                 stream=False):
     """Retrieve all registered referees from Euroleague BasketBall .
 
     Parameters
@@ -303,6 +314,9 @@ def all_referees(year=None, offset=0, limit=500, competition_code=None):
         Offset base zero
     limit: int, optional
         number of items to retrieve
+    stream: bool, optional
+        decode the items while they are downloaded instead of decoding the
+        whole response at once. Streamed responses are not cached.
 
     Returns
     -------
@@ -328,8 +342,8 @@ def all_referees(year=None, offset=0, limit=500, competition_code=None):
     elif competition_code is None and year:
         warnings.warn('No competitions found, returning all referees')
 
-    res = client.get(url)
-    return [Referee(**r) for r in res.json()]
+    data = _get_list(url, stream)
+    return [Referee.from_api(r) for r in data]
 
 
 def referee(referee_code):
@@ -347,11 +361,11 @@ def referee(referee_code):
     """
     params = {'version': 2.0}
     url = client.build_url('referees', referee_code, **params)
-    res = client.get(url)
-    return Referee(**res.json())
+    data = client.get_json(url)
+    return Referee.from_api(data)
 
 
-def venues(offset=0, limit=500):
+def venues(offset=0, limit=500, stream=False):
     """Retrieve all venues.
 
     Parameters
@@ -360,6 +374,9 @@ def venues(offset=0, limit=500):
         Offset base zero
     limit: int, optional
         number of items to retrieve
+    stream: bool, optional
+        decode the items while they are downloaded instead of decoding the
+        whole response at once. Streamed responses are not cached.
 
     Returns
     -------
@@ -374,8 +391,8 @@ def venues(offset=0, limit=500):
     """
     params = {'version': 2.0, 'offset': offset, 'limit': limit}
     url = client.build_url('venues', **params)
-    res = client.get(url)
-    return [Venue(**r) for r in res.json()]
+    data = _get_list(url, stream)
+    return [Venue.from_api(r) for r in data]
 
 
 def venue(venue_code):
@@ -394,11 +411,12 @@ def venue(venue_code):
     """
     params = {'version': 2.0}
     url = client.build_url('venues', venue_code, **params)
-    res = client.get(url)
-    return Venue(**res.json())
+    data = client.get_json(url)
+    return Venue.from_api(data)
 
 
-def all_profile(offset=0, limit=500, with_bio=True, with_seasons=True):
+def all_profile(offset=0, limit=500, with_bio=True, with_seasons=True,
+                stream=False):
     """Retrieve all registered profile at Euroleague Basketball.
 
     Parameters
@@ -407,6 +425,9 @@ def all_profile(offset=0, limit=500, with_bio=True, with_seasons=True):
         Offset base zero
     limit: int, optional
         number of items to retrieve
+    stream: bool, optional
+        decode the items while they are downloaded instead of decoding the
+        whole response at once. Streamed responses are not cached.
 
     Returns
     -------
@@ -420,41 +441,135 @@ def all_profile(offset=0, limit=500, with_bio=True, with_seasons=True):
     """
     params = {'version': 2.0, 'offset': offset, 'limit': limit}
     url = client.build_url('people', **params)
-    res = client.get(url)
-    return [Person(**utils.normalize_keys(r)) for r in res.json()]
+    data = _get_list(url, stream)
+    return [Person.from_api(r) for r in data]
+
+
+def _parse_bio(data):
+    return Bio.from_api(data)
+
+
+def _parse_career(data):
+    return [PlayerSeason.from_api(s) for s in data]
+
 
+def _parse_profile(data, bio=None, career=None):
+    with tracing.span('construct'):
+        data = dict(data)
+        if bio is not None:
+            data['bio'] = _parse_bio(bio)
+        if career is not None:
+            data['career_history'] = _parse_career(career)
+        return Person.from_api(data)
 
-def profile(person_code, career_history=True): #008463 # 003331  #CWC
+
+def _fetch_bio(url):
+    return _parse_bio(client.get_json(url))
+
+
+def _fetch_career(url):
+    return _parse_career(client.get_json(url))
+
+
+def _profile_urls(person_code):
+    """Return the urls of a person, its bio and its seasons."""
+    params = {'version': 2.0}
+    return [client.build_url('people', person_code, *path, **params)
+            for path in [(), ('bio',), ('seasons',)]]
+
+
+@tracing.traced()
+def profile(person_code, career_history=True, lazy=False):
     """Retrieve one registered person from Euroleague BasketBall.
 
+    The person, bio and career history are requested concurrently.
+
     Parameters
     ----------
     person_code: str
         person id
+    career_history: bool, optional
+        if True, ``person.career_history`` lists the seasons of the person,
+        as :class:`PlayerSeason`
+    lazy: bool, optional
+        if True, only the person is requested, the bio and career history
+        are requested when first accessed
 
     Returns
     -------
     person: dataclass
         all information about a person
     """
-    params = {'version': 2.0}
-    url = client.build_url('people', person_code, **params)
-    res = client.get(url)
-    data = res.json()
-    bio_url = client.build_url('people', person_code, "bio", **params)
-    bio_res = client.get(bio_url)
-    bio_res = bio_res.json()
-    bio_res['summary'] = bio_res.pop('career', None)
-    bio_res['highlights'] = bio_res.pop('misc', None)
-    data['bio'] = Bio(**bio_res)
+    url, bio_url, career_url = _profile_urls(person_code)
+    if lazy:
+        data = dict(client.get_json(url))
+        data['bio'] = dec.Deferred(_fetch_bio, bio_url)
+        if career_history:
+            data['career_history'] = dec.Deferred(_fetch_career, career_url)
+        return dec.lazy_dataclass(Person).from_api(data)
+
+    bio = client.submit(client.get_json, bio_url)
+    career = None
     if career_history:
-       extra_url = client.build_url('people', person_code, "seasons", **params)
-       extra_res = client.get(bio_url)
+        career = client.submit(client.get_json, career_url)
+    data = client.get_json(url)
+    return _parse_profile(data, bio.result(),
+                          career.result() if career else None)
+
 
-    return Person(**utils.normalize_keys(data))
+@tracing.traced()
+def profiles(person_codes, career_history=True, concurrency=8):
+    """Retrieve many registered people from Euroleague BasketBall.
 
+    Each code is requested once. People whose requests are all in the
+    cache are served without contacting the API; the requests of the
+    others are sent by a pool of ``concurrency`` threads.
 
-def all_teams(offset=0, limit=500):
+    Parameters
+    ----------
+    person_codes: iterable of str
+        person ids
+    career_history: bool, optional
+        if True, attach the seasons of each person, see :func:`profile`
+    concurrency: int, optional
+        maximum number of simultaneous requests
+
+    Returns
+    -------
+    persons: list
+        one item per code, in the order of ``person_codes``: the person, or
+        the exception raised while retrieving it
+    """
+    person_codes = list(person_codes)
+    results = {}
+    pending = {}
+    for code in dict.fromkeys(person_codes):
+        urls = _profile_urls(code)[:3 if career_history else 2]
+        cached = [client.cached_json(url) for url in urls]
+        if any(data is None for data in cached):
+            pending[code] = urls
+            continue
+        try:
+            results[code] = _parse_profile(*cached)
+        except Exception as e:
+            results[code] = e
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=concurrency,
+                                thread_name_prefix='hoopster-bulk') as pool:
+            futures = {code: [client.submit_to(pool, client.get_json, url)
+                              for url in urls]
+                       for code, urls in pending.items()}
+            for code, requests in futures.items():
+                try:
+                    results[code] = _parse_profile(
+                        *[f.result() for f in requests])
+                except Exception as e:
+                    results[code] = e
+    return [results[code] for code in person_codes]
+
+
+def all_teams(offset=0, limit=500, stream=False):
     """Retrieve all registered teams.
 
     Parameters
@@ -463,6 +578,9 @@ def all_teams(offset=0, limit=500):
         Offset base zero
     limit: int, optional
         number of items to retrieve
+    stream: bool, optional
+        decode the items while they are downloaded instead of decoding the
+        whole response at once. Streamed responses are not cached.
 
     Returns
     -------
@@ -477,8 +595,8 @@ def all_teams(offset=0, limit=500):
     """
     params = {'version': 2.0, 'offset': offset, 'limit': limit}
     url = client.build_url('clubs', **params)
-    res = client.get(url)
-    return [Team(**r) for r in res.json()]
+    data = _get_list(url, stream)
+    return [Team.from_api(r) for r in data]
 
 
 def team(team_code):
@@ -497,8 +615,8 @@ def team(team_code):
     """
     params = {'version': 2.0}
     url = client.build_url('clubs', team_code, **params)
-    res = client.get(url)
-    return Team(**res.json())
+    data = client.get_json(url)
+    return Team.from_api(data)
 
 
 def game_records(team_code, competition_code):
@@ -518,8 +636,8 @@ def game_records(team_code, competition_code):
     params = {'version': 2.0}
     url = client.build_url('clubs', team_code, 'competition', competition_code,
                            'gamerecords', **params)
-    res = client.get(url)
-    return [GameRecord(**r) for r in res.json()]
+    data = client.get_json(url)
+    return [GameRecord.from_api(r) for r in data]
 
 
 def player_highs(team_code, competition_code):
@@ -539,8 +657,8 @@ def player_highs(team_code, competition_code):
     params = {'version': 2.0}
     url = client.build_url('clubs', team_code, 'competition', competition_code,
                            'playerhighs', **params)
-    res = client.get(url)
-    return [GameRecord(**r) for r in res.json()]
+    data = client.get_json(url)
+    return [GameRecord.from_api(r) for r in data]
 
 
 def season_records(team_code, competition_code):
@@ -560,8 +678,8 @@ def season_records(team_code, competition_code):
     params = {'version': 2.0}
     url = client.build_url('clubs', team_code, 'competition', competition_code,
                            'seasonrecords', **params)
-    res = client.get(url)
-    return [GameRecord(**r) for r in res.json()]
+    data = client.get_json(url)
+    return [GameRecord.from_api(r) for r in data]
 
 
 def latest_team_videos(team_code):
@@ -580,8 +698,8 @@ def latest_team_videos(team_code):
     """
     params = {'version': 2.0}
     url = client.build_url('clubs', team_code, 'videos', **params)
-    res = client.get(url)
-    return [Video(**r) for r in res.json()]
+    data = client.get_json(url)
+    return [Video.from_api(r) for r in data]
 
 
 def all_competitions():
@@ -600,8 +718,8 @@ def all_competitions():
     """
     params = {'version': 2.0}
     url = client.build_url('competitions', **params)
-    res = client.get(url)
-    return [Competition(**r) for r in res.json()]
+    data = client.get_json(url)
+    return [Competition.from_api(r) for r in data]
 
 
 def competition(competition_code):
@@ -620,8 +738,8 @@ def competition(competition_code):
     """
     params = {'version': 2.0}
     url = client.build_url('competitions', competition_code, **params)
-    res = client.get(url)
-    return Competition(**res.json())
+    data = client.get_json(url)
+    return Competition.from_api(data)
 
 
 def all_seasons(competition_code):
@@ -641,8 +759,22 @@ def all_seasons(competition_code):
     params = {'version': 2.0}
     url = client.build_url('competitions', competition_code, 'seasons',
                            **params)
-    res = client.get(url)
-    return [Season(**r) for r in res.json()]
+    data = client.get_json(url)
+    seasons = [Season.from_api(r) for r in data]
+    _pin_past_seasons(competition_code, seasons)
+    return seasons
+
+
+def _pin_past_seasons(competition_code, seasons):
+    """Mark everything about the seasons before the current one as final."""
+    years = [s.year for s in seasons if s.year is not None]
+    if not years:
+        return
+    current = max(years)
+    client.pin(*[client.build_url('competitions', competition_code,
+                                  'seasons', s.code, '**')
+                 for s in seasons
+                 if s.code and s.year is not None and s.year < current])
 
 
 def season(year, competition_code):
@@ -663,11 +795,12 @@ def season(year, competition_code):
     params = {'version': 2.0}
     url = client.build_url('competitions', competition_code, 'seasons',
                            season_code, **params)
-    res = client.get(url)
-    return [Season(**r) for r in res.json()]
+    data = client.get_json(url)
+    return [Season.from_api(r) for r in data]
 
 
-def games(competition_code, season_code, only_played=False):
+@tracing.traced()
+def games(competition_code, season_code, only_played=False, lazy=False):
     """Returns all games from a competition season
 
     Parameters
@@ -676,31 +809,45 @@ def games(competition_code, season_code, only_played=False):
         [description]
     season_code : [type]
         [description]
+    lazy : bool, optional
+        if True, the nested objects of the games, like ``game.local.team``,
+        are built from the payload when first accessed. The games have the
+        same attributes and compare equal to the plain ones.
     """
     params = {'version': 2.0}
     url = client.build_url('competitions', competition_code, 'seasons',
                            season_code, 'games', **params)
-    res = client.get(url)
-    games = []
-    for game in res.json():
-        game["season"] = utils.normalize_keys(game["season"])
-        game["group"] = utils.normalize_keys(game["group"])
-        game["phase_type"] = utils.normalize_keys(game.pop("phaseType"))
-        game["local"] = utils.normalize_keys(game["local"])
-        game["road"] = utils.normalize_keys(game["road"])
-        game["local"]["team"] = utils.normalize_keys(game["local"].pop("club"))
-        game["road"]["team"] = utils.normalize_keys(game["road"].pop("club"))
-        # import ipdb; ipdb.set_trace()
-        current = Game(**utils.normalize_keys(game))
-        if not only_played:
-            games += [current, ]
-            continue
-        if current.played:
-            games += [current, ]
+    data = client.get_json(url)
+    games = _parse_games(data, lazy)
+    _pin_played_games(competition_code, season_code, games)
+    if only_played:
+        games = [g for g in games if g.played]
     return games
 
 
-def game_stats(competition_code, season_code, game_code):
+def _pin_played_games(competition_code, season_code, games):
+    """Mark the box scores of the played games as final."""
+    for game in games:
+        if game.played and game.game_code is not None:
+            path = ('competitions', competition_code, 'seasons',
+                    season_code, 'games', game.game_code)
+            client.pin(client.build_url(*path),
+                       client.build_url(*path, 'stats'))
+
+
+def _parse_game(game):
+    with tracing.span('construct'):
+        return Game.from_api(game)
+
+
+def _parse_games(data, lazy=False):
+    build = dec.lazy_dataclass(Game).from_api if lazy else Game.from_api
+    with tracing.span('construct', count=len(data)):
+        return [build(game) for game in data]
+
+
+@tracing.traced()
+def game_stats(competition_code, season_code, game_code, lazy=False):
     """Returns all games from a competition season
 
     Parameters
@@ -709,14 +856,217 @@ def game_stats(competition_code, season_code, game_code):
         [description]
     season_code : [type]
         [description]
+    lazy : bool, optional
+        if True, the nested objects of the box score, like
+        ``stats.local.players[0].stats``, are built from the payload when
+        first accessed
     """
     params = {'version': 2.0}
     url = client.build_url('competitions', competition_code, 'seasons',
                            season_code, 'games', game_code, 'stats', **params)
-    res = client.get(url)
-    game = utils.normalize_nested_dict_keys(res.json())
-    game = GameStats(**game)
-    return game
+    data = client.get_json(url)
+    return _parse_game_stats(data, lazy)
+
+
+def _parse_game_stats(data, lazy=False):
+    cls = dec.lazy_dataclass(GameStats) if lazy else GameStats
+    with tracing.span('construct'):
+        return cls.from_api(data)
+
+
+def season_game_stats(competition_code, season_code, workers=8,
+                      progress=None):
+    """Fetch the box scores of all the played games of a season.
+
+    The box scores are requested concurrently by a pool of ``workers``
+    threads and yielded as they arrive.
+
+    Parameters
+    ----------
+    competition_code : str
+        competition id, e.g. ``'E'``
+    season_code : str
+        season id, e.g. ``'E2021'``
+    workers : int, optional
+        maximum number of simultaneous requests
+    progress : callable, optional
+        called with the number of box scores received so far and the total
+        after each one
+
+    Yields
+    ------
+    game : Game
+        a played game
+    stats : GameStats or Exception
+        its box score, or the exception raised while retrieving it
+
+    Examples
+    --------
+    >>> for game, stats in season_game_stats('E', 'E2021'):  # doctest: +SKIP
+    ...     print(game.game_code, stats.local.total)
+    """
+    played = games(competition_code, season_code, only_played=True)
+    total = len(played)
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='hoopster-bulk') as pool:
+        futures = {client.submit_to(pool, game_stats, competition_code,
+                                    season_code, game.game_code): game
+                   for game in played}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    stats = e
+                if progress is not None:
+                    progress(done, total)
+                yield futures[future], stats
+        finally:
+            # the consumer stopped early
+            for future in futures:
+                future.cancel()
+
+
+def _pages(listing, page_size=500, prefetch=0, executor=None, **kwargs):
+    """Yield in order the pages of an offset/limit listing.
+
+    Up to ``prefetch`` following pages are fetched in ``executor``, the
+    shared thread pool by default, while the current one is consumed.
+    Iteration stops after the first page shorter than ``page_size``.
+    """
+    if page_size < 1:
+        raise ValueError("page_size should be positive")
+    offsets = itertools.count(0, page_size)
+    if prefetch < 1:
+        for offset in offsets:
+            page = listing(offset=offset, limit=page_size, **kwargs)
+            yield page
+            if len(page) < page_size:
+                return
+
+    if executor is None:
+        submit = client.submit
+    else:
+        submit = functools.partial(client.submit_to, executor)
+    window = collections.deque(
+        submit(listing, offset=next(offsets), limit=page_size, **kwargs)
+        for _ in range(prefetch + 1))
+    try:
+        while window:
+            page = window.popleft().result()
+            if len(page) < page_size:
+                yield page
+                return
+            window.append(submit(listing, offset=next(offsets),
+                                 limit=page_size, **kwargs))
+            yield page
+    finally:
+        for future in window:
+            future.cancel()
+
+
+def fetch_all(listing, page_size=500, workers=8, expected=None, **kwargs):
+    """Fetch every item of an offset/limit listing with parallel requests.
+
+    The pages are requested concurrently by a pool of ``workers`` threads
+    and merged back in order. Requests are sent for all the pages holding
+    the ``expected`` items at once, then for the next pages as results come
+    in, until the first short page.
+
+    Parameters
+    ----------
+    listing: callable
+        listing taking ``offset`` and ``limit`` parameters, e.g.
+        :func:`all_profile`, :func:`all_referees`, :func:`venues` or
+        :func:`all_teams`
+    page_size: int, optional
+        number of items requested at once
+    workers: int, optional
+        maximum number of simultaneous requests
+    expected: int, optional
+        estimated number of items
+    kwargs: dict, optional
+        extra parameters of ``listing``
+
+    Returns
+    -------
+    items: list
+        all items, in the order of the API
+
+    Examples
+    --------
+    >>> people = fetch_all(all_profile, expected=13336)  # doctest: +SKIP
+    """
+    window = workers
+    if expected:
+        window = max(window, -(-expected // page_size) + 1)
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='hoopster-bulk') as executor:
+        pages = _pages(listing, page_size, window - 1, executor=executor,
+                       **kwargs)
+        return [item for page in pages for item in page]
+
+
+def iter_profiles(page_size=500, prefetch=0, stream=False):
+    """Iterate over all registered people at Euroleague Basketball.
+
+    Parameters
+    ----------
+    page_size: int, optional
+        number of people requested at once
+    prefetch: int, optional
+        number of pages fetched in background ahead of the iteration
+    stream: bool, optional
+        decode each page while it is downloaded, see :func:`all_profile`
+
+    Yields
+    ------
+    person: dataclass
+        registered person, in the order of the API
+    """
+    for page in _pages(all_profile, page_size, prefetch, stream=stream):
+        yield from page
+
+
+def iter_referees(year=None, competition_code=None, page_size=500,
+                  prefetch=0, stream=False):
+    """Iterate over all registered referees.
+
+    See :func:`all_referees` and :func:`iter_profiles` for the parameters.
+
+    Yields
+    ------
+    referee: dataclass
+    """
+    for page in _pages(all_referees, page_size, prefetch, year=year,
+                       competition_code=competition_code, stream=stream):
+        yield from page
+
+
+def iter_venues(page_size=500, prefetch=0, stream=False):
+    """Iterate over all venues.
+
+    See :func:`iter_profiles` for the parameters.
+
+    Yields
+    ------
+    venue: dataclass
+    """
+    for page in _pages(venues, page_size, prefetch, stream=stream):
+        yield from page
+
+
+def iter_teams(page_size=500, prefetch=0, stream=False):
+    """Iterate over all registered teams.
+
+    See :func:`iter_profiles` for the parameters.
+
+    Yields
+    ------
+    team: dataclass
+    """
+    for page in _pages(all_teams, page_size, prefetch, stream=stream):
+        yield from page
 
 
 if __name__ == "__main__":
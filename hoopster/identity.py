@@ -0,0 +1,143 @@
+"""Identity map of the objects built from the API payloads.
+
+The same team, season or country is repeated in every game of a season,
+and the same players in every box score. While an identity map is active,
+the models declared with ``intern=True``, like :class:`hoopster.elb.Team`,
+are interned by their ``from_api`` constructors: a payload equal to one
+already seen gives back the object built from it, so equal objects are
+shared, and compared by identity. The strings of the interned models,
+like codes and names, are interned with :func:`sys.intern`::
+
+    from hoopster import identity
+
+    with identity.scope(identity.IdentityMap()):
+        games = elb.games('E', 'E2021')
+
+    assert games[0].season is games[1].season
+
+An identity map can be scoped to a block of code with :func:`scope`, or be
+set for all the calls with :func:`set_identity_map`. The interned objects
+are kept until the map is cleared or dropped.
+"""
+
+import contextvars
+import sys
+from dataclasses import fields
+
+_identity_map = None
+_UNSET = object()
+_scoped = contextvars.ContextVar('hoopster_identity_map', default=_UNSET)
+
+
+def get_identity_map():
+    """Return the identity map used outside of any :func:`scope`, or
+    None."""
+    return _identity_map
+
+
+def set_identity_map(identity_map):
+    """Intern the objects of all the API calls into ``identity_map``.
+
+    Parameters
+    ----------
+    identity_map : IdentityMap or None
+        None disables interning.
+
+    Returns
+    -------
+    previous : IdentityMap or None
+        The identity map that was in use.
+    """
+    global _identity_map
+    previous = _identity_map
+    _identity_map = identity_map
+    return previous
+
+
+def current():
+    """Return the identity map in use in the current context, or None."""
+    identity_map = _scoped.get()
+    return _identity_map if identity_map is _UNSET else identity_map
+
+
+class scope:
+    """Context manager using ``identity_map`` in the code it wraps.
+
+    The scope follows the calls into the thread pool of
+    :func:`hoopster.client.submit` and into asyncio tasks.
+
+    Parameters
+    ----------
+    identity_map : IdentityMap or None
+        None disables interning in the scope.
+    """
+
+    def __init__(self, identity_map):
+        self.identity_map = identity_map
+        self._token = None
+
+    def __enter__(self):
+        self._token = _scoped.set(self.identity_map)
+        return self.identity_map
+
+    def __exit__(self, exc_type, exc, tb):
+        _scoped.reset(self._token)
+
+
+def _key(value):
+    cls = value.__class__
+    if cls is dict:
+        return tuple([(k, _key(v)) for k, v in value.items()])
+    if cls is list:
+        return list, tuple([_key(v) for v in value])
+    if cls is str or value is None:
+        return value
+    if cls is int or cls is float or cls is bool:
+        return cls, value
+    return cls, id(value)
+
+
+class IdentityMap:
+    """Table of the interned models, by class and API payload.
+
+    Parameters
+    ----------
+    strings : bool, optional
+        Intern the strings of the models too. Default: True.
+
+    Notes
+    -----
+    Interned models are shared, including the lists and dicts of their
+    fields, which must not be modified.
+    """
+
+    def __init__(self, strings=True):
+        self.strings = strings
+        self._objects = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def lookup(self, cls, raw):
+        """Return the key of the ``cls`` object built from the payload
+        ``raw``, and the object interned under it, or None."""
+        key = (cls, _key(raw))
+        existing = self._objects.get(key)
+        if existing is not None:
+            self.hits += 1
+        return key, existing
+
+    def add(self, key, obj):
+        """Intern ``obj`` under ``key``, and return the interned object."""
+        if self.strings:
+            for f in fields(obj):
+                value = getattr(obj, f.name)
+                if value.__class__ is str:
+                    object.__setattr__(obj, f.name, sys.intern(value))
+        return self._objects.setdefault(key, obj)
+
+    def clear(self):
+        """Forget the interned models."""
+        self._objects.clear()
+        self.hits = 0
@@ -0,0 +1,247 @@
+"""Instrumentation of the API requests.
+
+Requests are aggregated by route template, e.g. every ``people/{code}``
+url is counted under ``'people/{person_code}'``::
+
+    from hoopster import client
+    from hoopster.metrics import Metrics
+
+    client.set_metrics(Metrics())
+    elb.profile('P000001')
+    client.get_metrics().snapshot()['people/{person_code}']['requests']
+"""
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+from hoopster.cache import match_route, route
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+# the parameter names are the ones of the hoopster.elb functions
+TEMPLATES = [
+    'people/{person_code}',
+    'people/{person_code}/bio',
+    'people/{person_code}/seasons',
+    'clubs/{team_code}',
+    'clubs/{team_code}/videos',
+    'clubs/{team_code}/competition/{competition_code}/{record}',
+    'referees/{referee_code}',
+    'venues/{venue_code}',
+    'competitions/{competition_code}',
+    'competitions/{competition_code}/referees',
+    'competitions/{competition_code}/seasons',
+    'competitions/{competition_code}/seasons/{season_code}',
+    'competitions/{competition_code}/seasons/{season_code}/referees',
+    'competitions/{competition_code}/seasons/{season_code}/games',
+    'competitions/{competition_code}/seasons/{season_code}/games/{game_code}',
+    'competitions/{competition_code}/seasons/{season_code}/games/{game_code}'
+    '/stats',
+]
+
+
+def _pattern(template):
+    return '/'.join('*' if s.startswith('{') else s
+                    for s in template.split('/'))
+
+
+class Histogram:
+    """Cumulative histogram, as defined by Prometheus.
+
+    Parameters
+    ----------
+    buckets : sequence of float
+        Sorted upper bounds of the buckets. An infinite bucket is added.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return the ``(upper bound, count)`` pairs of the buckets."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def snapshot(self):
+        return {'buckets': self.cumulative(), 'sum': self.sum,
+                'count': self.count}
+
+
+class RouteMetrics:
+    """Metrics of the requests of one route template."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.requests = 0
+        self.statuses = Counter()
+        self.retries = 0
+        self.bytes = 0
+        self.latency = Histogram(buckets)
+        self.cache = Counter()
+        self.decode = Histogram(buckets)
+
+    def snapshot(self):
+        return {'requests': self.requests,
+                'statuses': dict(self.statuses),
+                'retries': self.retries,
+                'bytes': self.bytes,
+                'latency': self.latency.snapshot(),
+                'cache': dict(self.cache),
+                'decode': self.decode.snapshot()}
+
+
+class Metrics:
+    """Thread-safe registry of the request metrics, by route template.
+
+    Parameters
+    ----------
+    buckets : sequence of float, optional
+        Upper bounds, in seconds, of the latency and decode time histograms.
+    templates : list, optional
+        Route templates relative to the API root, e.g.
+        ``'people/{person_code}'``. A route matching no template is
+        reported as is. Default: :data:`TEMPLATES`.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, templates=None):
+        self.buckets = tuple(buckets)
+        templates = TEMPLATES if templates is None else templates
+        self._templates = [(_pattern(t), t) for t in templates]
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def template(self, url):
+        """Return the route template of ``url``."""
+        path = route(url)
+        for pattern, template in self._templates:
+            if match_route(path, pattern):
+                return template
+        return path
+
+    def _route(self, url):
+        template = self.template(url)
+        metrics = self._routes.get(template)
+        if metrics is None:
+            metrics = self._routes.setdefault(template,
+                                              RouteMetrics(self.buckets))
+        return metrics
+
+    def record_request(self, url, status, elapsed, size=0, retries=0):
+        """Record a request, after its last attempt.
+
+        Parameters
+        ----------
+        url : str
+        status : int or str
+            status code of the response, or name of the exception raised
+        elapsed : float
+            time from the first attempt to the response, in seconds
+        size : int, optional
+            number of bytes of the response body
+        retries : int, optional
+            number of attempts after the first one
+        """
+        with self._lock:
+            metrics = self._route(url)
+            metrics.requests += 1
+            metrics.statuses[status] += 1
+            metrics.retries += retries
+            metrics.bytes += size
+            metrics.latency.observe(elapsed)
+
+    def record_cache(self, url, outcome):
+        """Record a cache lookup, ``outcome`` is ``'hit'``, ``'miss'`` or
+        ``'revalidated'``."""
+        with self._lock:
+            self._route(url).cache[outcome] += 1
+
+    def record_decode(self, url, elapsed):
+        """Record the time spent decoding a response body."""
+        with self._lock:
+            self._route(url).decode.observe(elapsed)
+
+    def snapshot(self):
+        """Return a copy of the metrics as plain dicts, by route template."""
+        with self._lock:
+            return {t: m.snapshot() for t, m in self._routes.items()}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def to_prometheus(self, namespace='hoopster'):
+        """Return the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def header(name, kind, doc):
+            lines.append('# HELP {}_{} {}'.format(namespace, name, doc))
+            lines.append('# TYPE {}_{} {}'.format(namespace, name, kind))
+
+        def sample(name, labels, value):
+            labels = ','.join('{}="{}"'.format(k, _escape(v))
+                              for k, v in labels.items())
+            lines.append('{}_{}{{{}}} {}'.format(namespace, name, labels,
+                                                 _number(value)))
+
+        def histogram(name, doc, key):
+            header(name, 'histogram', doc)
+            for template, metrics in snapshot.items():
+                hist = metrics[key]
+                if not hist['count']:
+                    continue
+                for bound, count in hist['buckets']:
+                    sample(name + '_bucket',
+                           {'route': template, 'le': _number(bound)}, count)
+                sample(name + '_sum', {'route': template}, hist['sum'])
+                sample(name + '_count', {'route': template}, hist['count'])
+
+        header('requests_total', 'counter', 'Requests sent to the API.')
+        for template, metrics in snapshot.items():
+            for status, count in metrics['statuses'].items():
+                sample('requests_total',
+                       {'route': template, 'status': status}, count)
+        header('request_retries_total', 'counter', 'Retried attempts.')
+        for template, metrics in snapshot.items():
+            if metrics['requests']:
+                sample('request_retries_total', {'route': template},
+                       metrics['retries'])
+        header('response_bytes_total', 'counter', 'Bytes of the responses.')
+        for template, metrics in snapshot.items():
+            if metrics['requests']:
+                sample('response_bytes_total', {'route': template},
+                       metrics['bytes'])
+        histogram('request_duration_seconds',
+                  'Time from the first attempt to the response.', 'latency')
+        header('cache_lookups_total', 'counter', 'Lookups of the cache.')
+        for template, metrics in snapshot.items():
+            for outcome, count in metrics['cache'].items():
+                sample('cache_lookups_total',
+                       {'route': template, 'outcome': outcome}, count)
+        histogram('decode_duration_seconds',
+                  'Time spent decoding the JSON bodies.', 'decode')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"') \
+        .replace('\n', r'\n')
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
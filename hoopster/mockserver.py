@@ -0,0 +1,695 @@
+"""Local mock of the Euroleague v2 API for load and throughput testing.
+
+The server implements the routes used by :mod:`hoopster.elb`. Payloads
+come from a data source: a :class:`SyntheticSource` generating a
+deterministic fake league, a directory of JSON fixtures or a cassette
+written by :class:`hoopster.transport.RecordingTransport`. Latency, error
+rate and throttling can be tuned to exercise the client stack::
+
+    from hoopster.constants import API_URLS
+    from hoopster.mockserver import MockServer
+
+    with MockServer(latency=0.02, error_rate=0.01, rate=200) as server:
+        API_URLS[2.0] = server.url
+        elb.game_stats('E', 'E2021', 1)
+
+It can also be started from the command line::
+
+    python -m hoopster.mockserver --port 8080 --latency 0.05 --rate 100
+"""
+
+import argparse
+import base64
+import functools
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from hoopster.cache import match_route, route
+from hoopster.ratelimit import TokenBucket
+
+API_PREFIX = 'api/v2.0/'
+
+_FIRST_NAMES = ['Nikola', 'Sergio', 'Vasilije', 'Kostas', 'Mike', 'Shane',
+                'Walter', 'Facundo', 'Jan', 'Will', 'Tornike', 'Nando']
+_LAST_NAMES = ['Mirotic', 'Llull', 'Micic', 'Sloukas', 'James', 'Larkin',
+               'Tavares', 'Campazzo', 'Vesely', 'Clyburn', 'Shengelia',
+               'De Colo']
+_CITIES = [('ESP', 'Spain', 'Madrid'), ('ESP', 'Spain', 'Barcelona'),
+           ('GRE', 'Greece', 'Athens'), ('GRE', 'Greece', 'Piraeus'),
+           ('TUR', 'Turkey', 'Istanbul'), ('ITA', 'Italy', 'Milan'),
+           ('ISR', 'Israel', 'Tel Aviv'), ('LTU', 'Lithuania', 'Kaunas'),
+           ('FRA', 'France', 'Villeurbanne'), ('GER', 'Germany', 'Munich'),
+           ('SRB', 'Serbia', 'Belgrade'), ('RUS', 'Russia', 'Moscow')]
+_STATS = ['timePlayed', 'valuation', 'points', 'fieldGoalsMade2',
+          'fieldGoalsAttempted2', 'fieldGoalsMade3', 'fieldGoalsAttempted3',
+          'freeThrowsMade', 'freeThrowsAttempted', 'fieldGoalsMadeTotal',
+          'fieldGoalsAttemptedTotal', 'accuracyMade', 'accuracyAttempted',
+          'totalRebounds', 'defensiveRebounds', 'offensiveRebounds',
+          'assistances', 'steals', 'turnovers', 'blocksFavour',
+          'blocksAgainst', 'foulsCommited', 'foulsReceived', 'plusMinus']
+
+
+def _memoized(method):
+    """Memoize a method in the ``_memo`` dict of its instance, which lives
+    and dies with it."""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__,) + args
+        value = self._memo.get(key)
+        if value is None:
+            value = self._memo[key] = method(self, *args)
+        return value
+    return wrapper
+
+
+class SyntheticSource:
+    """Deterministic generator of a fake league.
+
+    Payloads are generated on demand from the route, so even large
+    leagues cost nothing until they are requested.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed of the generator, the same seed gives the same league.
+    n_clubs : int, optional
+        Number of clubs per competition.
+    n_people : int, optional
+        Number of registered people.
+    n_referees : int, optional
+        Number of registered referees.
+    n_venues : int, optional
+        Number of venues.
+    years : sequence of int, optional
+        Years of the seasons. Every game of the last one after
+        ``played_ratio`` of the calendar is not played yet.
+    played_ratio : float, optional
+        Fraction of the games of the current season already played.
+    players_per_team : int, optional
+        Number of players in a box score.
+    """
+
+    COMPETITIONS = {'E': 'EuroLeague', 'U': 'EuroCup'}
+
+    def __init__(self, seed=0, n_clubs=18, n_people=2000, n_referees=300,
+                 n_venues=100, years=range(2015, 2022), played_ratio=0.6,
+                 players_per_team=10):
+        self.seed = seed
+        self.n_clubs = n_clubs
+        self.n_people = max(n_people, 2 * n_clubs * players_per_team)
+        self.n_referees = n_referees
+        self.n_venues = max(n_venues, n_clubs)
+        self.years = list(years)
+        self.played_ratio = played_ratio
+        self.players_per_team = players_per_team
+        self._memo = {}
+        self._routes = [
+            ('people', self.people),
+            ('people/*', self.person),
+            ('people/*/bio', self.bio),
+            ('people/*/seasons', self.person_seasons),
+            ('clubs', self.clubs),
+            ('clubs/*', self.club),
+            ('clubs/*/videos', self.videos),
+            ('clubs/*/competition/*/*', self.records),
+            ('referees', self.referees),
+            ('referees/*', self.referee),
+            ('competitions/*/referees', self.referees),
+            ('competitions/*/seasons/*/referees', self.referees),
+            ('venues', self.venues),
+            ('venues/*', self.venue),
+            ('competitions', self.competitions),
+            ('competitions/*', self.competition),
+            ('competitions/*/seasons', self.seasons),
+            ('competitions/*/seasons/*', self.season),
+            ('competitions/*/seasons/*/games', self.games),
+            ('competitions/*/seasons/*/games/*', self.game),
+            ('competitions/*/seasons/*/games/*/stats', self.game_stats),
+        ]
+
+    def __call__(self, path):
+        parts = path.split('/')
+        for pattern, fn in self._routes:
+            if match_route(path, pattern):
+                args = [p for p, pat in zip(parts, pattern.split('/'))
+                        if pat == '*']
+                try:
+                    return fn(*args)
+                except (KeyError, ValueError, IndexError):
+                    return None
+        return None
+
+    def _rng(self, *key):
+        return random.Random(':'.join(map(str, (self.seed,) + key)))
+
+    # registry
+
+    def _country(self, index):
+        code, name, _ = _CITIES[index % len(_CITIES)]
+        return {'code': code, 'name': name}
+
+    @_memoized
+    def _person(self, index):
+        if not 0 <= index < self.n_people:
+            raise KeyError(index)
+        rng = self._rng('person', index)
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        country = self._country(rng.randrange(len(_CITIES)))
+        return {
+            'code': 'P{:06d}'.format(index),
+            'name': '{}, {}'.format(last.upper(), first.upper()),
+            'alias': '{} {}'.format(first, last),
+            'aliasRaw': '{} {}'.format(first, last),
+            'passportName': first,
+            'passportSurname': last,
+            'jerseyName': last.upper(),
+            'abbreviatedName': '{}. {}'.format(first[0], last),
+            'country': country,
+            'height': rng.randint(180, 220),
+            'weight': rng.randint(75, 120),
+            'birthDate': '{}-{:02d}-{:02d}T00:00:00'.format(
+                rng.randint(1980, 2003), rng.randint(1, 12),
+                rng.randint(1, 28)),
+            'birthCountry': country,
+            'twitterAccount': None,
+            'images': {'headshot': 'https://img/{}.png'.format(index)},
+        }
+
+    def _person_index(self, code):
+        return int(code.lstrip('P'))
+
+    def people(self):
+        return [self._person(i) for i in range(self.n_people)]
+
+    def person(self, code):
+        return self._person(self._person_index(code))
+
+    def bio(self, code):
+        person = self.person(code)
+        return {'career': 'Career of {}.'.format(person['alias']),
+                'misc': 'Highlights of {}.'.format(person['alias'])}
+
+    def person_seasons(self, code):
+        index = self._person_index(code)
+        person = self._person(index)
+        club = index // self.players_per_team % self.n_clubs
+        return [self._player_season(person, 'E', year, club, index)
+                for year in self.years]
+
+    def _player_season(self, person, competition, year, club, index):
+        return {
+            'person': person,
+            'type': 'J',
+            'typeName': 'Player',
+            'active': year == self.years[-1],
+            'startDate': '{}-08-01T00:00:00'.format(year),
+            'endDate': '{}-07-01T00:00:00'.format(year + 1),
+            'dorsal': str(index % 99),
+            'dorsalRaw': str(index % 99),
+            'position': index % 5 + 1,
+            'positionName': ['Guard', 'Forward', 'Center'][index % 3],
+            'lastTeam': None,
+            'images': {},
+            'club': self._club(club),
+            'season': self.season(competition, competition + str(year)),
+        }
+
+    @_memoized
+    def _venue(self, index):
+        if not 0 <= index < self.n_venues:
+            raise KeyError(index)
+        _, _, city = _CITIES[index % len(_CITIES)]
+        return {'code': 'V{:03d}'.format(index),
+                'name': '{} Arena {}'.format(city, index),
+                'capacity': 5000 + 137 * index % 15000,
+                'address': '{} Street, {}'.format(index, city),
+                'images': {}, 'active': True, 'notes': None}
+
+    def venues(self):
+        return [self._venue(i) for i in range(self.n_venues)]
+
+    def venue(self, code):
+        return self._venue(int(code.lstrip('V')))
+
+    @_memoized
+    def _club(self, index):
+        if not 0 <= index < self.n_clubs:
+            raise KeyError(index)
+        _, _, city = _CITIES[index % len(_CITIES)]
+        code = 'C{:02d}'.format(index)
+        return {
+            'code': code,
+            'name': '{} Basketball {}'.format(city, index),
+            'abbreviatedName': city[:3].upper(),
+            'alias': '{} {}'.format(city, index),
+            'isVirtual': False,
+            'country': self._country(index),
+            'address': '{} Avenue, {}'.format(index, city),
+            'website': 'https://club{}.example'.format(index),
+            'ticketsUrl': None,
+            'twitterAccount': None,
+            'tvCode': code,
+            'venue': self._venue(index),
+            'venueBackup': None,
+            'nationalCompetitionCode': None,
+            'city': city,
+            'president': None,
+            'phone': None,
+            'images': {'crest': 'https://img/{}.png'.format(code)},
+        }
+
+    def clubs(self):
+        return [self._club(i) for i in range(self.n_clubs)]
+
+    def club(self, code):
+        return self._club(int(code.lstrip('C')))
+
+    def videos(self, code):
+        self.club(code)
+        return [{'code': '{}-{}'.format(code, i), 'provider': 'youtube',
+                 'title': 'Highlights {}'.format(i)} for i in range(5)]
+
+    def records(self, code, competition, kind):
+        if kind not in ('gamerecords', 'playerhighs', 'seasonrecords'):
+            return None
+        self.club(code)
+        rng = self._rng('records', code, competition, kind)
+        return [{'categoryCode': category, 'categoryName': category.title(),
+                 'value': rng.randint(10, 130),
+                 'opponentTeamName': self._club(
+                     rng.randrange(self.n_clubs))['name'],
+                 'seasonCode': competition + str(year),
+                 'gameCode': rng.randint(1, 300), 'phaseType': 'RS',
+                 'gameDate': '{}-11-01T20:00:00'.format(year),
+                 'seasonYear': year}
+                for category, year in zip(['points', 'rebounds', 'assists'],
+                                          self.years)]
+
+    @_memoized
+    def _referee(self, index):
+        if not 0 <= index < self.n_referees:
+            raise KeyError(index)
+        rng = self._rng('referee', index)
+        country = self._country(rng.randrange(len(_CITIES)))
+        return {'code': 'R{:04d}'.format(index),
+                'name': '{}, {}'.format(rng.choice(_LAST_NAMES).upper(),
+                                        rng.choice(_FIRST_NAMES).upper()),
+                'alias': None, 'nationality': country['code'],
+                'country': country, 'images': {}, 'active': True}
+
+    def referees(self, *competition):
+        return [self._referee(i) for i in range(self.n_referees)]
+
+    def referee(self, code):
+        return self._referee(int(code.lstrip('R')))
+
+    # competitions
+
+    def competitions(self):
+        return [self.competition(code) for code in self.COMPETITIONS]
+
+    def competition(self, code):
+        return {'code': code, 'name': self.COMPETITIONS[code]}
+
+    def seasons(self, competition):
+        return [self.season(competition, competition + str(year))
+                for year in self.years]
+
+    def season(self, competition, season_code):
+        self.competition(competition)
+        year = int(season_code[len(competition):])
+        if year not in self.years:
+            raise KeyError(season_code)
+        return {'name': '{} {}-{}'.format(self.COMPETITIONS[competition],
+                                          year, str(year + 1)[2:]),
+                'code': season_code,
+                'alias': '{}-{}'.format(year, str(year + 1)[2:]),
+                'competitionCode': competition, 'year': year}
+
+    def _schedule(self):
+        # double round robin, one (local, road) pair per game code
+        clubs = range(self.n_clubs)
+        return [(a, b) for a in clubs for b in clubs if a != b]
+
+    def _game(self, competition, season_code, game_code):
+        season = self.season(competition, season_code)
+        schedule = self._schedule()
+        if not 1 <= game_code <= len(schedule):
+            raise KeyError(game_code)
+        local, road = schedule[game_code - 1]
+        played = (season['year'] != self.years[-1] or
+                  game_code <= self.played_ratio * len(schedule))
+        rng = self._rng('game', season_code, game_code)
+        rounds = 2 * (self.n_clubs - 1)
+        round_ = (game_code - 1) * rounds // len(schedule) + 1
+        date = '{}-{:02d}-{:02d}T20:00:00'.format(
+            season['year'] + (round_ > rounds // 2),
+            (round_ * 8 // rounds + 9) % 12 + 1, round_ % 28 + 1)
+
+        def side(club):
+            score = rng.randint(60, 110) if played else 0
+            return {'club': self._club(club), 'score': score,
+                    'standingsScore': score}
+
+        return {
+            'gameCode': game_code,
+            'season': season,
+            'group': {'id': 1, 'order': 1, 'name': 'Regular Season',
+                      'rawName': 'Regular Season'},
+            'phaseType': {'code': 'RS', 'alias': 'Regular Season',
+                          'name': 'Regular Season', 'isGroupPhase': False},
+            'round': round_,
+            'roundAlias': 'Round {}'.format(round_),
+            'roundName': 'Round {}'.format(round_),
+            'played': played,
+            'date': date,
+            'confirmedDate': True,
+            'confirmedHour': True,
+            'localTimeZone': 1,
+            'localDate': date,
+            'utcDate': date,
+            'local': side(local),
+            'road': side(road),
+        }
+
+    def games(self, competition, season_code):
+        return [self._game(competition, season_code, code)
+                for code in range(1, len(self._schedule()) + 1)]
+
+    def game(self, competition, season_code, game_code):
+        return self._game(competition, season_code, int(game_code))
+
+    def _stats(self, rng, played=True, **extra):
+        stats = {key: rng.randint(0, 20) if played else 0 for key in _STATS}
+        stats['timePlayed'] = rng.randint(0, 2400) if played else 0
+        stats.update(extra)
+        return stats
+
+    def game_stats(self, competition, season_code, game_code):
+        game = self.game(competition, season_code, game_code)
+        rng = self._rng('stats', season_code, game_code)
+        year = game['season']['year']
+
+        def side(team):
+            club = int(team['club']['code'].lstrip('C'))
+            first = club * self.players_per_team
+            players = []
+            for index in range(first, first + self.players_per_team):
+                person = self._person(index % self.n_people)
+                players.append({
+                    'player': self._player_season(person, competition, year,
+                                                  club, index),
+                    'stats': self._stats(rng, game['played'],
+                                         dorsal=str(index % 99),
+                                         startFive=index - first < 5,
+                                         startFive2=index - first < 5)})
+            coach = self._person((first + self.n_clubs * self.players_per_team)
+                                 % self.n_people)
+            return {'coach': {'code': coach['code'], 'name': coach['name']},
+                    'players': players,
+                    'team': self._stats(rng, game['played']),
+                    'total': self._stats(rng, game['played'])}
+
+        return {'local': side(game['local']), 'road': side(game['road'])}
+
+
+class DirectorySource:
+    """Serve JSON fixtures stored as ``<route>.json`` files.
+
+    Parameters
+    ----------
+    path : str
+        root directory, e.g. the file ``people/P000001.json`` is served for
+        the route ``people/P000001``
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, path):
+        filename = os.path.join(self.path, *path.split('/')) + '.json'
+        if not os.path.isfile(filename):
+            return None
+        with open(filename, 'rb') as f:
+            return json.load(f)
+
+
+class CassetteSource:
+    """Serve the GET responses of a cassette.
+
+    Parameters
+    ----------
+    path : str
+        cassette written by :class:`hoopster.transport.RecordingTransport`
+    """
+
+    # the pages of a listing are recorded separately, one per query
+    paginates = True
+
+    def __init__(self, path):
+        self._payloads = {}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record['method'] != 'GET' or record['status'] != 200:
+                    continue
+                payload = json.loads(base64.b64decode(record['body']))
+                query = parse_qsl(urlsplit(record['url']).query)
+                self._payloads[_query_key(route(record['url']),
+                                          query)] = payload
+
+    def __call__(self, path, query=None):
+        query = query or {}
+        payload = self._payloads.get(_query_key(path, query.items()))
+        if payload is None and query:
+            # a listing recorded in one request
+            payload = _paginate(self._payloads.get(_query_key(path, ())),
+                                query)
+        return payload
+
+
+def _query_key(path, query):
+    return path, tuple(sorted(query))
+
+
+def _paginate(payload, query):
+    """Return the page of a list payload selected by the offset and limit
+    query parameters."""
+    if isinstance(payload, list) and 'limit' in query:
+        offset = int(query.get('offset', 0))
+        payload = payload[offset:offset + int(query['limit'])]
+    return payload
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, avoid delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server.mock
+        status, payload, headers = server.answer(self.path, self.headers)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockServer:
+    """Threaded HTTP server mocking the Euroleague v2 API.
+
+    Parameters
+    ----------
+    source : callable, optional
+        Function of a route, e.g. ``people/P000001``, returning the JSON
+        payload or None for a 404. Lists are paginated with the ``offset``
+        and ``limit`` query parameters, unless the source has a true
+        ``paginates`` attribute: it is then called with the dict of query
+        parameters too, like :class:`CassetteSource`. Default: a
+        :class:`SyntheticSource`.
+    host : str, optional
+    port : int, optional
+        Default: a free port.
+    latency : float, optional
+        Time to answer each request, in seconds.
+    jitter : float, optional
+        Random extra latency, uniformly drawn between 0 and ``jitter``.
+    error_rate : float, optional
+        Fraction of the requests answered with a 503 error.
+    rate : float, optional
+        Number of requests per second served before answering 429 with a
+        ``Retry-After`` header. Default: unlimited.
+    burst : int, optional
+        Burst size of the throttling, see
+        :class:`hoopster.ratelimit.TokenBucket`.
+    seed : int, optional
+        Seed of the injected latencies and errors.
+
+    Attributes
+    ----------
+    stats : collections.Counter
+        number of answers per status code
+    max_in_flight : int
+        highest number of requests being answered at the same time, can be
+        reset to 0
+    """
+
+    def __init__(self, source=None, host='127.0.0.1', port=0, latency=0.0,
+                 jitter=0.0, error_rate=0.0, rate=None, burst=None, seed=0):
+        self.source = source or SyntheticSource()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle = None if rate is None else TokenBucket(rate, burst)
+        self.stats = Counter()
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Root url of the mocked API, to use as ``API_URLS[2.0]``."""
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}/{}'.format(host, port, API_PREFIX)
+
+    def answer(self, path, headers):
+        """Return the status, body and headers answering a request."""
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            return self._answer(path, headers)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _answer(self, path, headers):
+        parts = urlsplit(path)
+        path = parts.path.strip('/')
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):]
+        query = dict(parse_qsl(parts.query))
+
+        if self.throttle is not None:
+            wait = self.throttle.try_acquire()
+            if wait:
+                return self._count(429, {}, {'Retry-After': '{:.3f}'.format(
+                    wait)})
+
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return self._count(503, {'message': 'Service Unavailable'})
+
+        if getattr(self.source, 'paginates', False):
+            payload = self.source(path, query)
+        else:
+            payload = _paginate(self.source(path), query)
+        if payload is None:
+            return self._count(404, {'message': 'Not Found'})
+
+        body = json.dumps(payload).encode('utf-8')
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        if headers.get('If-None-Match') == etag:
+            return self._count(304, None, {'ETag': etag})
+        return self._count(200, body, {'ETag': etag})
+
+    def _count(self, status, body, headers=None):
+        with self._lock:
+            self.stats[status] += 1
+        if body is None:
+            body = b''
+        elif not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        return status, body, headers or {}
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve requests in the calling thread."""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='latency of each answer, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='random extra latency, in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of the answers failing with 503')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='requests per second before answering 429')
+    parser.add_argument('--burst', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--fixtures', help='directory of JSON fixtures')
+    group.add_argument('--cassette', help='cassette of recorded responses')
+    args = parser.parse_args(argv)
+
+    if args.fixtures:
+        source = DirectorySource(args.fixtures)
+    elif args.cassette:
+        source = CassetteSource(args.cassette)
+    else:
+        source = SyntheticSource(seed=args.seed)
+    server = MockServer(source, host=args.host, port=args.port,
+                        latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, rate=args.rate,
+                        burst=args.burst, seed=args.seed)
+    print('Serving the mock API on {}'.format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
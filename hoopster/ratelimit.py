@@ -0,0 +1,146 @@
+"""Rate limiting of the API requests."""
+
+import asyncio
+import threading
+import time
+
+from hoopster.cache import match_route, route
+
+
+class TokenBucket:
+    """Token bucket shared by threads and event loops.
+
+    Each request takes a token; tokens come back at ``rate`` per second up
+    to ``burst``. A request arriving on an empty bucket reserves the next
+    token to come, so waiting callers are served in arrival order.
+
+    Parameters
+    ----------
+    rate : float
+        Sustained number of requests per second.
+    burst : int, optional
+        Number of requests that can be sent at once after an idle period.
+        Default: ``max(1, rate)``.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate should be positive")
+        self.rate = rate
+        self.burst = max(1, rate) if burst is None else burst
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self):
+        """Take a token if one is available.
+
+        Returns
+        -------
+        wait : float
+            0 when a token was taken, else the time until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request can be sent."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request can be
+        sent."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """Process-wide limits of the request rate.
+
+    A request must get a token from the global bucket, if any, and from
+    the bucket of the first route pattern matching its url.
+
+    Parameters
+    ----------
+    rate : float, optional
+        Global number of requests per second. Default: unlimited.
+    burst : int, optional
+        Global burst size, see :class:`TokenBucket`.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        self._global = None if rate is None else TokenBucket(rate, burst)
+        self._routes = []
+        self._lock = threading.Lock()
+
+    def set_limit(self, rate, burst=None, prefix=None):
+        """Set or remove a rate limit.
+
+        Parameters
+        ----------
+        rate : float or None
+            Number of requests per second. None removes the limit.
+        burst : int, optional
+            Burst size, see :class:`TokenBucket`.
+        prefix : str, optional
+            Route prefix or pattern relative to the API root, e.g.
+            ``'people'`` or ``'competitions/*/seasons/*/games'``. Default:
+            the global limit.
+        """
+        bucket = None if rate is None else TokenBucket(rate, burst)
+        if prefix is None:
+            self._global = bucket
+            return
+        pattern = prefix.strip('/')
+        if not pattern.endswith('**'):
+            pattern += '/**'
+        with self._lock:
+            routes = [r for r in self._routes if r[0] != pattern]
+            if bucket is not None:
+                routes.insert(0, (pattern, bucket))
+            self._routes = routes
+
+    def buckets(self, url):
+        """Return the buckets a request to ``url`` takes a token from."""
+        buckets = [] if self._global is None else [self._global]
+        if self._routes:
+            path = route(url)
+            for pattern, bucket in self._routes:
+                if match_route(path, pattern):
+                    buckets.append(bucket)
+                    break
+        return buckets
+
+    def acquire(self, url):
+        """Block until a request to ``url`` can be sent."""
+        delay = max([b.reserve() for b in self.buckets(url)], default=0)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, url):
+        """Wait until a request to ``url`` can be sent."""
+        delay = max([b.reserve() for b in self.buckets(url)], default=0)
+        if delay:
+            await asyncio.sleep(delay)
@@ -0,0 +1,119 @@
+"""Retry policy of the API requests."""
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from hoopster.constants import IDEMPOTENT_REQUEST_METHODS, RETRY_STATUS_CODES
+
+
+@dataclass(frozen=True)
+class Attempt:
+    """Report of one attempt of a request, given to the ``attempt`` hooks.
+
+    ``delay`` is the time waited before the next attempt, None when the
+    attempt is the last one.
+    """
+
+    method: str
+    url: str
+    number: int
+    elapsed: float
+    status_code: int = None
+    error: Exception = None
+    delay: float = None
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is sent again.
+
+    The wait before the attempt ``n + 1`` is
+    ``backoff_factor * 2 ** (n - 1)`` seconds, capped to ``backoff_max``
+    and randomly shortened by up to ``jitter`` of its value. When the API
+    answers with a ``Retry-After`` header, its value is used instead.
+
+    Parameters
+    ----------
+    total : int, optional
+        Maximum number of attempts, 1 disables retries.
+    backoff_factor : float, optional
+        Wait before the first retry, in seconds.
+    backoff_max : float, optional
+        Maximum wait computed by the backoff curve, in seconds.
+    jitter : float, optional
+        Fraction, between 0 and 1, of the wait that is randomized.
+    status_codes : list, optional
+        HTTP status codes worth retrying.
+    methods : list, optional
+        HTTP methods that can be retried. Only idempotent methods are
+        retried by default.
+    retry_after_max : float, optional
+        Give up when the API asks to wait longer than this, in seconds.
+    """
+
+    def __init__(self, total=5, backoff_factor=0.5, backoff_max=30.0,
+                 jitter=0.5, status_codes=None, methods=None,
+                 retry_after_max=300.0):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes or RETRY_STATUS_CODES)
+        self.methods = frozenset(methods or IDEMPOTENT_REQUEST_METHODS)
+        self.retry_after_max = retry_after_max
+
+    def backoff(self, number):
+        """Return the wait after the failed attempt ``number``."""
+        delay = min(self.backoff_max,
+                    self.backoff_factor * 2 ** (number - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def delay(self, method, number, response=None, error=None):
+        """Return the wait before the next attempt.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request
+        number : int
+            number of the attempt that just failed, starting at 1
+        response : Response, optional
+            response of the attempt
+        error : Exception, optional
+            transient error, like a connection reset, raised by the attempt
+
+        Returns
+        -------
+        delay : float or None
+            seconds to wait, or None if the request must not be retried
+        """
+        if number >= self.total or method not in self.methods:
+            return None
+        if error is None and (response is None or
+                              response.status_code not in self.status_codes):
+            return None
+
+        retry_after = None
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get(
+                'Retry-After'))
+        if retry_after is None:
+            return self.backoff(number)
+        if retry_after > self.retry_after_max:
+            return None
+        return retry_after
+
+
+def parse_retry_after(value):
+    """Return the seconds to wait given by a ``Retry-After`` header."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,96 @@
+"""Coalescing of identical concurrent calls."""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Share the result of a call among the threads asking for it at the
+    same time.
+
+    While a call for ``key`` is running, other callers of :meth:`do` with
+    the same key wait for it and get its result, or its exception, instead
+    of running their own.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` unless a call for ``key`` is running.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Share the result of a coroutine among the tasks awaiting it at the
+    same time. See :class:`SingleFlight`.
+
+    The coroutine runs in its own task. A cancelled caller stops waiting
+    for it without affecting the others; the task is cancelled only when
+    no caller waits for it any more.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        """Await ``fn(*args, **kwargs)`` unless a call for ``key`` is
+        running in the current event loop."""
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        call = self._calls.get(key)
+        if call is None:
+            task = loop.create_task(fn(*args, **kwargs))
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(
+                functools.partial(self._finish, key, call))
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if call[1] == 1 and not task.done():
+                # new callers start another call
+                self._forget(key, call)
+                task.cancel()
+            raise
+        finally:
+            call[1] -= 1
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _finish(self, key, call, task):
+        self._forget(key, call)
+        if not task.cancelled():
+            # mark the exception as retrieved when nobody waits any more
+            task.exception()
+
+    def __len__(self):
+        return len(self._calls)
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+import pytest
+
+import hoopster.client as client
+from hoopster.cache import CachePolicy, MemoryCache
+from hoopster.constants import API_URLS
+from hoopster.mockserver import MockServer, SyntheticSource
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.client_address))
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+        path, _, query = self.path.partition('?')
+        path = path.strip('/')
+        query = dict(parse_qsl(query))
+        answer = server.routes.get(path, (404, {}))
+        if isinstance(answer, list):
+            answer = answer.pop(0) if len(answer) > 1 else answer[0]
+        status, body, *headers = answer
+        headers = headers[0] if headers else {}
+        if isinstance(body, list) and 'limit' in query:
+            offset = int(query.get('offset', 0))
+            body = body[offset:offset + int(query['limit'])]
+        payload = json.dumps(body).encode()
+        etag = headers.get('ETag')
+        if etag and self.headers.get('If-None-Match') == etag:
+            status, payload = 304, b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    """Local HTTP server standing in for the v2 API.
+
+    Tests register JSON bodies in ``api_server.routes`` keyed by path,
+    e.g. ``api_server.routes['venues'] = (200, [...])``, optionally
+    followed by a dict of response headers. List bodies are paginated with
+    the ``offset`` and ``limit`` query parameters. A list of such answers is
+    served in sequence, the last one being repeated. ``api_server.delay``
+    sets the latency of the answers, during which requests are counted as
+    in flight: ``api_server.max_in_flight`` tells how many overlapped.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.requests = []
+    server.delay = 0
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setitem(API_URLS, 2.0, f'http://{host}:{port}/')
+    previous = client.set_session(client.Session())
+    previous_cache = client.set_cache(MemoryCache())
+    previous_policy = client.set_cache_policy(CachePolicy())
+    yield server
+    client.close()
+    client.set_session(previous)
+    client.set_cache(previous_cache)
+    client.set_cache_policy(previous_policy)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    """Mock API serving a small synthetic league, see
+    :class:`hoopster.mockserver.MockServer`. Tests tune its latency, error
+    rate or throttling before sending requests."""
+    server = MockServer(SyntheticSource(n_clubs=4, n_people=100)).start()
+    monkeypatch.setitem(API_URLS, 2.0, server.url)
+    previous = client.set_session(client.Session())
+    previous_cache = client.set_cache(MemoryCache())
+    previous_policy = client.set_cache_policy(CachePolicy())
+    yield server
+    client.close()
+    client.set_session(previous)
+    client.set_cache(previous_cache)
+    client.set_cache_policy(previous_policy)
+    server.stop()
@@ -0,0 +1,70 @@
+""" """
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import hoopster.aio as aio  # noqa: E402
+from hoopster.aio import elb  # noqa: E402
+
+
+def test_gather_teams(api_server):
+    codes = ['BAR', 'MAD', 'PAN']
+    for code in codes:
+        api_server.routes[f'clubs/{code}'] = (200, {'code': code})
+
+    async def main():
+        async with aio.AsyncSession(concurrency=2) as session:
+            previous = aio.set_session(session)
+            try:
+                return await asyncio.gather(*[elb.team(c) for c in codes])
+            finally:
+                aio.set_session(previous)
+
+    teams = asyncio.run(main())
+    assert teams == [elb.Team(code=c) for c in codes]
+
+
+def test_error_status(api_server):
+    async def main():
+        try:
+            await elb.venue('missing')
+        finally:
+            await aio.close()
+
+    with pytest.raises(IOError):
+        asyncio.run(main())
+
+
+def test_profile(api_server):
+    api_server.routes['people/P1'] = (200, {'code': 'P1'})
+    api_server.routes['people/P1/bio'] = (200, {'career': 'c'})
+    api_server.routes['people/P1/seasons'] = (200, [{'dorsal': '7'}])
+
+    async def main():
+        try:
+            return await elb.profile('P1')
+        finally:
+            await aio.close()
+
+    person = asyncio.run(main())
+    assert person.bio.summary == 'c'
+    assert person.career_history == [elb.PlayerSeason(dorsal='7')]
+
+
+def test_session_across_loops(api_server):
+    for code in ['BAR', 'MAD']:
+        api_server.routes[f'clubs/{code}'] = (200, {'code': code})
+    session = aio.AsyncSession()
+    previous = aio.set_session(session)
+    try:
+        assert asyncio.run(elb.team('BAR')).code == 'BAR'
+        # closed with the loop that created it
+        first = session._session
+        assert first.closed
+        assert asyncio.run(elb.team('MAD')).code == 'MAD'
+        assert session._session is not first and session._session.closed
+    finally:
+        aio.set_session(previous)
@@ -0,0 +1,111 @@
+""" """
+
+import hoopster.client as client
+import hoopster.elb as elb
+from hoopster.cache import (FOREVER, CacheEntry, CachePolicy, SQLiteCache,
+                            match_route)
+
+
+def test_match_route():
+    assert match_route('competitions', 'competitions')
+    assert match_route('competitions/E', 'competitions/*')
+    assert not match_route('competitions/E/seasons', 'competitions/*')
+    assert match_route('competitions/E/seasons', 'competitions/**')
+
+
+def test_policy_expires():
+    policy = CachePolicy({'venues': 60})
+    url = client.build_url('venues')
+    assert policy.expires(url, {}, now=0) == 60
+    assert policy.expires(url, {'Cache-Control': 'max-age=5'}, now=0) == 5
+    assert policy.expires(url, {'Cache-Control': 'no-store'}, now=0) is None
+    assert policy.expires(client.build_url('referees'), {}, now=0) == 0
+
+
+def test_fresh_response_is_served_from_cache(api_server):
+    api_server.routes['competitions'] = (200, [{'code': 'E'}])
+    assert elb.all_competitions() == elb.all_competitions()
+    assert len(api_server.requests) == 1
+
+
+def test_revalidation(api_server):
+    api_server.routes['referees/OJDN'] = (200, {'code': 'OJDN'},
+                                          {'ETag': '"v1"'})
+    url = client.build_url('referees', 'OJDN')
+    first = client.get_json(url)
+    second = client.get_json(url)
+    assert len(api_server.requests) == 2
+    # the 304 answer reuses the already decoded content
+    assert second is first
+
+
+def test_sqlite_cache(api_server, tmp_path):
+    api_server.routes['people/KRV'] = (200, {'code': 'KRV'})
+    url = client.build_url('people', 'KRV')
+    path = str(tmp_path / 'cache.sqlite')
+
+    client.set_cache(SQLiteCache(path))
+    assert client.get_json(url) == {'code': 'KRV'}
+    # a new process reopening the database finds the response
+    client.set_cache(SQLiteCache(path))
+    assert client.get_json(url) == {'code': 'KRV'}
+    assert len(api_server.requests) == 1
+
+    cache = SQLiteCache(path)
+    assert url in cache and len(cache) == 1
+    cache.set(url, CacheEntry(data=[1], expires=FOREVER))
+    assert cache.get(url).body == b'[1]'
+    assert cache.get(url).expires == FOREVER
+    cache.clear()
+    assert cache.get(url) is None
+
+
+def test_pinned_routes():
+    policy = CachePolicy({})
+    policy.pin('competitions/E/seasons/E2019/**')
+    policy.pin('competitions/E/seasons/E2021/games/3/stats')
+    for path in ['competitions/E/seasons/E2019',
+                 'competitions/E/seasons/E2019/games/1/stats',
+                 'competitions/E/seasons/E2021/games/3/stats']:
+        url = client.build_url(path)
+        assert policy.is_pinned(url)
+        assert policy.expires(url, {'Cache-Control': 'no-cache'}) == FOREVER
+    assert not policy.is_pinned(
+        client.build_url('competitions/E/seasons/E2021/games/4/stats'))
+
+
+def test_played_games_are_final(api_server):
+    game = {'gameCode': 1, 'played': True, 'season': {}, 'group': {},
+            'phaseType': {}, 'local': {'club': {'code': 'A'}},
+            'road': {'club': {'code': 'B'}}}
+    games_path = 'competitions/E/seasons/E2021/games'
+    api_server.routes[games_path] = (
+        200, [game, dict(game, gameCode=2, played=False)])
+    api_server.routes[games_path + '/1/stats'] = (200, {})
+    api_server.routes[games_path + '/2/stats'] = (200, {})
+    client.set_cache_policy(CachePolicy({}))
+
+    assert len(elb.games('E', 'E2021', only_played=True)) == 1
+    for _ in range(2):
+        elb.game_stats('E', 'E2021', 1)
+        elb.game_stats('E', 'E2021', 2)
+    paths = [p for p, _ in api_server.requests]
+    assert paths.count('/' + games_path + '/1/stats') == 1
+    assert paths.count('/' + games_path + '/2/stats') == 2
+
+
+def test_live_box_score_becomes_final(mock_api):
+    mock_api.source.played_ratio = 0
+    live = elb.game_stats('E', 'E2021', 1)
+    assert live.local.total.points == 0
+    assert elb.game_stats('E', 'E2021', 1) == live
+    assert mock_api.stats[200] == 1
+
+    # the game is over, its box score is now pinned
+    mock_api.source.played_ratio = 1
+    assert elb.games('E', 'E2021', only_played=True)
+    final = elb.game_stats('E', 'E2021', 1)
+    assert final.local.total.points > 0
+    # fetched once more, then served forever from the cache
+    assert elb.game_stats('E', 'E2021', 1) == final
+    assert mock_api.stats[200] == 3
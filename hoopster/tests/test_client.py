@@ -0,0 +1,69 @@
+""" """
+
+import json
+
+import hoopster.client as client
+import hoopster.elb as elb
+
+
+def test_build_url():
+    url = client.build_url('people', 'KRV', version=2.0)
+    assert url.endswith('/people/KRV')
+
+
+def test_session_reuses_connections(api_server):
+    api_server.routes['referees'] = (200, [{'code': 'R1'}, {'code': 'R2'}])
+    for _ in range(3):
+        assert [r.code for r in elb.all_referees()] == ['R1', 'R2']
+    # a single persistent connection served every request
+    assert len({addr for _, addr in api_server.requests}) == 1
+
+
+def test_session_lifecycle(api_server):
+    api_server.routes['referees'] = (200, [])
+    with client.Session(keep_alive=False) as session:
+        previous = client.set_session(session)
+        elb.all_referees()
+        elb.all_referees()
+        assert client.get_session() is session
+        client.set_session(previous)
+    assert session._session is None
+    assert len({addr for _, addr in api_server.requests}) == 2
+
+
+def test_iter_json(api_server):
+    people = [{'code': f'P{i}', 'name': 'x' * i} for i in range(50)]
+    api_server.routes['people'] = (200, people)
+    url = client.build_url('people')
+    assert list(client.iter_json(url, chunk_size=7)) == people
+    persons = elb.all_profile(stream=True)
+    assert [p.code for p in persons] == [p['code'] for p in people]
+
+
+def test_pluggable_decoder(api_server):
+    api_server.routes['referees'] = (200, [{'code': 'R1'}])
+    bodies = []
+
+    def decoder(content):
+        bodies.append(content)
+        return json.loads(content)
+
+    previous = client.set_decoder(decoder)
+    try:
+        assert [r.code for r in elb.all_referees()] == ['R1']
+        assert [r.code for r in elb.all_referees(stream=True)] == ['R1']
+    finally:
+        client.set_decoder(previous)
+    # streamed responses are decoded by the json module
+    assert bodies == [b'[{"code": "R1"}]']
+    assert client.set_decoder(None) is previous
+
+
+def test_cached_json(api_server):
+    api_server.routes['venues'] = (200, [{'code': 'V1'}])
+    url = client.build_url('venues')
+    assert client.cached_json(url) is None
+    assert not api_server.requests
+    data = client.get_json(url)
+    assert client.cached_json(url) is data
+    assert len(api_server.requests) == 1
@@ -0,0 +1,114 @@
+""" """
+
+import pickle
+from dataclasses import FrozenInstanceError, dataclass, field
+from typing import List
+
+import pytest
+
+import hoopster.decorators as dec
+
+
+@dataclass(frozen=True)
+class Leaf:
+    code: str = None
+
+
+@dec.nested_dataclass(frozen=True)
+class Node:
+    leaf: Leaf = None
+    leaves: List[Leaf] = None
+    images: dict = None
+
+
+def test_nested_dataclass():
+    node = Node(leaf={'code': 'a'}, leaves=[{'code': 'b'}, Leaf('c')],
+                images={'code': 'x'})
+    assert node.leaf == Leaf('a')
+    assert node.leaves == [Leaf('b'), Leaf('c')]
+    assert node.images == {'code': 'x'}
+    assert Node(Leaf('a')).leaf == Leaf('a')
+    # fields keep their defaults without keyword arguments
+    assert Node().leaf is None
+
+
+def test_nested_dataclass_init_once():
+    calls = []
+
+    @dec.nested_dataclass(frozen=True)
+    class Counted:
+        leaf: Leaf = None
+        name: str = None
+        alias: str = None
+
+        def __post_init__(self):
+            calls.append(self.leaf)
+
+    Counted(leaf={'code': 'a'}, name='n', alias='x')
+    assert calls == [Leaf('a')]
+
+
+def test_from_api():
+    @dec.nested_dataclass(frozen=True)
+    class Item:
+        code: str
+        tv_code: str = None
+        node: Node = field(default=None, metadata={'api': 'club'})
+        tags: list = field(default_factory=list)
+
+    item = Item.from_api({'code': 'a', 'tvCode': 'TV', 'unknown': 1,
+                          'club': {'leaf': {'code': 'b'},
+                                   'leaves': [{'code': 'c'}]}})
+    assert item == Item(code='a', tv_code='TV',
+                        node=Node(leaf={'code': 'b'},
+                                  leaves=[{'code': 'c'}]))
+    # normalized keys are accepted too
+    assert Item.from_api({'code': 'a', 'tv_code': 'TV'}).tv_code == 'TV'
+    with pytest.raises(TypeError):
+        Item.from_api({'tvCode': 'TV'})
+
+
+@dec.nested_dataclass(frozen=True, slots=True)
+class Slotted:
+    code: str
+    leaf: Leaf = None
+
+
+@dec.nested_dataclass(frozen=True, slots=True)
+class SlottedChild(Slotted):
+    extra: int = 0
+
+
+def test_slots():
+    obj = SlottedChild('a', leaf={'code': 'b'}, extra=1)
+    assert not hasattr(obj, '__dict__')
+    assert SlottedChild.__slots__ == ('extra',)
+    assert obj.leaf == Leaf('b') and Slotted('a').leaf is None
+    assert hash(obj) == hash(SlottedChild('a', Leaf('b'), 1))
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(obj, protocol)) == obj
+    with pytest.raises(FrozenInstanceError):
+        obj.code = 'c'
+    with pytest.raises(FrozenInstanceError):
+        obj.other = 'c'
+    assert SlottedChild.from_api({'code': 'a', 'extra': 2}).extra == 2
+
+
+@dec.nested_dataclass(frozen=True)
+class Tree:
+    node: Node = None
+    nodes: List[Node] = None
+    name: str = None
+
+
+def test_lazy_from_api():
+    raw = {'node': {'leaf': {'code': 'a'}}, 'nodes': [{'images': {}}],
+           'name': 'n'}
+    lazy = dec.lazy_dataclass(Tree).from_api(raw)
+    assert isinstance(vars(lazy)['node'], dec.Deferred)
+    assert isinstance(vars(lazy)['nodes'], dec.Deferred)
+    assert lazy.node.leaf == Leaf('a')
+    assert type(lazy.node) is dec.lazy_dataclass(Node)
+    assert isinstance(vars(lazy)['nodes'], dec.Deferred)
+    assert lazy == Tree.from_api(raw) and Tree.from_api(raw) == lazy
+    assert pickle.loads(pickle.dumps(lazy)).__class__ is Tree
@@ -1,5 +1,11 @@
 """ """
 
+import pickle
+
+import pytest
+
+import hoopster.client as client
+import hoopster.decorators as dec
 import hoopster.elb as elb
 
 
@@ -8,6 +14,105 @@ def test_referees():
     # print(r)
 
 
+def _person_routes(api_server):
+    api_server.routes['people/P1'] = (200, {'code': 'P1', 'jerseyName': 'J'})
+    api_server.routes['people/P1/bio'] = (200, {'career': 'c', 'misc': 'm'})
+    api_server.routes['people/P1/seasons'] = (200, [
+        {'type': 'J', 'typeName': 'Player', 'dorsal': '7',
+         'club': {'code': 'MAD', 'abbreviatedName': 'RMB'},
+         'season': {'code': 'E2021', 'competitionCode': 'E'}}])
+
+
+def test_profile(api_server):
+    _person_routes(api_server)
+    api_server.delay = 0.2
+    person = elb.profile('P1')
+    # the three requests are sent at once
+    assert api_server.max_in_flight == 3
+    assert person.jersey_name == 'J'
+    assert person.bio == elb.Bio(summary='c', highlights='m')
+    [season] = person.career_history
+    assert season.type_name == 'Player'
+    assert season.club.abbreviated_name == 'RMB'
+    assert season.season.competition_code == 'E'
+    assert elb.profile('P1', career_history=False).career_history is None
+
+
+def test_profile_in_pool(mock_api):
+    # the sub-requests of calls running in the shared pool do not wait
+    # behind them
+    codes = ['P{:06d}'.format(i) for i in range(2 * client.MAX_WORKERS)]
+    futures = [client.submit(elb.profile, code) for code in codes]
+    assert [f.result(timeout=10).code for f in futures] == codes
+
+
+def test_profile_lazy(api_server):
+    _person_routes(api_server)
+    person = elb.profile('P1', lazy=True)
+    assert isinstance(person, elb.Person)
+    assert len(api_server.requests) == 1
+    assert person.bio.summary == 'c'
+    assert len(api_server.requests) == 2
+    assert person.career_history[0].dorsal == '7'
+    assert len(api_server.requests) == 3
+    person = pickle.loads(pickle.dumps(person))
+    assert type(person) is elb.Person and person.bio.highlights == 'm'
+
+
+def test_profiles(api_server):
+    for code in ['P1', 'P2']:
+        api_server.routes[f'people/{code}'] = (200, {'code': code})
+        api_server.routes[f'people/{code}/bio'] = (200, {'career': code})
+    api_server.delay = 0.1
+    elb.profiles(['P1'], career_history=False)
+    count = len(api_server.requests)
+    api_server.max_in_flight = 0
+    persons = elb.profiles(['P2', 'P1', 'P3', 'P2'], career_history=False,
+                           concurrency=4)
+    # P1 is cached, P2 is requested once, all at once
+    assert len(api_server.requests) - count == 4
+    assert api_server.max_in_flight == 4
+    assert [p.code for p in persons[:2]] == ['P2', 'P1']
+    assert isinstance(persons[2], elb.client.HTTPError)
+    assert persons[3] is persons[0]
+    assert persons[1].bio.summary == 'P1'
+
+
+def test_season_game_stats(mock_api):
+    mock_api.latency = 0.3
+    calls = []
+    results = list(elb.season_game_stats('E', 'E2021', workers=8,
+                                         progress=lambda *a: calls.append(a)))
+    # 1 request for the games, then the 7 box scores at once
+    assert mock_api.max_in_flight == 7
+    assert sorted(g.game_code for g, _ in results) == list(range(1, 8))
+    assert all(isinstance(s, elb.GameStats) for _, s in results)
+    assert calls == [(n, 7) for n in range(1, 8)]
+
+    mock_api.latency, mock_api.error_rate = 0, 1
+    previous = elb.client.set_retry_policy(None)
+    try:
+        with pytest.raises(elb.client.HTTPError):
+            next(elb.season_game_stats('E', 'E2020'))
+    finally:
+        elb.client.set_retry_policy(previous)
+
+
+def test_lazy_games(mock_api):
+    games = elb.games('E', 'E2021', lazy=True)
+    game = games[0]
+    assert isinstance(game, elb.Game)
+    assert isinstance(vars(game)['local'], dec.Deferred)
+    assert game.local.team.code
+    assert isinstance(vars(game.local)['team'], elb.Team)
+    assert games == elb.games('E', 'E2021')
+
+    played = [g for g in games if g.played][0]
+    stats = elb.game_stats('E', 'E2021', played.game_code, lazy=True)
+    assert stats.local.players[0].stats.points is not None
+    assert stats == elb.game_stats('E', 'E2021', played.game_code)
+
+
 if __name__ == "__main__":
     # test_referees()
     # pe = elb.people()
@@ -0,0 +1,51 @@
+""" """
+
+import sys
+
+import hoopster.decorators as dec
+import hoopster.elb as elb
+from hoopster import identity
+
+
+def test_games(mock_api):
+    identity_map = identity.IdentityMap()
+    with identity.scope(identity_map) as scoped:
+        assert scoped is identity_map and identity.current() is identity_map
+        games = elb.games('E', 'E2021')
+    assert identity.current() is None
+    assert all(g.season is games[0].season for g in games)
+    teams = {g.local.team.code: g.local.team for g in games}
+    assert all(g.road.team is teams[g.road.team.code] for g in games)
+    assert identity_map.hits > 0
+    code = games[0].local.team.code
+    assert code is sys.intern(code)
+
+    # no interning outside of the scope, same objects
+    plain = elb.games('E', 'E2021')
+    assert plain == games
+    assert plain[0].season is not plain[1].season
+
+
+def test_set_identity_map():
+    payload = {'code': 'C1', 'name': 'Club', 'country': {'code': 'ES'}}
+    identity_map = identity.IdentityMap()
+    previous = identity.set_identity_map(identity_map)
+    try:
+        team = elb.Team.from_api(payload)
+        assert elb.Team.from_api(dict(payload)) is team
+        assert elb.Team.from_api(dict(payload, name='Other')) is not team
+        # nested models are interned on their own
+        assert elb.Country.from_api({'code': 'ES'}) is team.country
+        with identity.scope(None):
+            assert elb.Team.from_api(payload) is not team
+        # lazy models keep their deferred fields
+        lazy = dec.lazy_dataclass(elb.Team).from_api(payload)
+        assert lazy is not team and lazy == team
+        # models without intern=True are built every time
+        game = {'gameCode': 1, 'local': {'club': payload}}
+        assert elb.Game.from_api(game) is not elb.Game.from_api(game)
+    finally:
+        identity.set_identity_map(previous)
+    assert len(identity_map) == 3
+    identity_map.clear()
+    assert len(identity_map) == 0
@@ -0,0 +1,79 @@
+""" """
+
+from dataclasses import replace
+
+import pytest
+
+import hoopster.client as client
+import hoopster.elb as elb
+from hoopster.metrics import Histogram, Metrics
+from hoopster.retry import RetryPolicy
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    previous = client.set_metrics(metrics)
+    yield metrics
+    client.set_metrics(previous)
+
+
+def test_template():
+    metrics = Metrics()
+    url = client.build_url('competitions', 'E', 'seasons', 'E2021', 'games',
+                           '12', 'stats', version=2.0)
+    assert metrics.template(url) == ('competitions/{competition_code}/'
+                                     'seasons/{season_code}/games/'
+                                     '{game_code}/stats')
+    assert metrics.template(url + '?limit=5') == metrics.template(url)
+    assert metrics.template(client.build_url('people')) == 'people'
+
+
+def test_histogram():
+    hist = Histogram([0.1, 1])
+    for value in [0.05, 0.1, 0.5, 3]:
+        hist.observe(value)
+    assert hist.cumulative() == [(0.1, 2), (1, 3), (float('inf'), 4)]
+    assert hist.count == 4 and hist.sum == pytest.approx(3.65)
+
+
+def test_record_requests(api_server, metrics):
+    api_server.routes['referees/R1'] = [(503, {}), (200, {'code': 'R1'})]
+    api_server.routes['referees/R2'] = (200, {'code': 'R2'}, {'ETag': '"1"'})
+    client.set_retry_policy(RetryPolicy(backoff_factor=0.01))
+    try:
+        elb.referee('R1')
+        elb.referee('R2')
+        with pytest.raises(client.HTTPError):
+            elb.referee('R3')
+    finally:
+        client.set_retry_policy(RetryPolicy())
+    snapshot = metrics.snapshot()['referees/{referee_code}']
+    assert snapshot['requests'] == 3
+    assert snapshot['statuses'] == {200: 2, 404: 1}
+    assert snapshot['retries'] == 1
+    assert snapshot['bytes'] == len(b'{"code": "R1"}') * 2 + 2
+    assert snapshot['latency']['count'] == 3
+    assert snapshot['cache'] == {'miss': 2}
+    assert snapshot['decode']['count'] == 2
+
+
+def test_cache_outcomes(api_server, metrics):
+    api_server.routes['people/P1'] = (200, {'code': 'P1'}, {'ETag': '"1"'})
+    url = client.build_url('people', 'P1')
+    client.get_json(url)
+    client.get_json(url)
+    # make the cached entry stale
+    cache = client.get_cache()
+    cache.set(url, replace(cache.get(url), expires=0))
+    client.get_json(url)
+    assert metrics.snapshot()['people/{person_code}']['cache'] == {
+        'miss': 1, 'hit': 1, 'revalidated': 1}
+
+    text = metrics.to_prometheus()
+    assert '# TYPE hoopster_request_duration_seconds histogram' in text
+    assert ('hoopster_requests_total{route="people/{person_code}",'
+            'status="304"} 1') in text
+    assert ('hoopster_cache_lookups_total{route="people/{person_code}",'
+            'outcome="hit"} 1') in text
+    assert 'le="+Inf"} 2' in text
@@ -0,0 +1,100 @@
+""" """
+
+import gc
+import json
+import weakref
+
+import pytest
+
+import hoopster.client as client
+import hoopster.elb as elb
+from hoopster.cache import MemoryCache
+from hoopster.constants import API_URLS
+from hoopster.mockserver import (CassetteSource, DirectorySource,
+                                 MockServer, SyntheticSource)
+from hoopster.ratelimit import TokenBucket
+from hoopster.retry import RetryPolicy
+from hoopster.transport import RecordingTransport
+
+
+def test_synthetic_league(mock_api):
+    games = elb.games('E', 'E2021')
+    assert len(games) == 12
+    assert sum(g.played for g in games) == 7
+    stats = elb.game_stats('E', 'E2021', 3)
+    assert len(stats.local.players) == 10
+    assert stats.local.players[0].player.season.code == 'E2021'
+    person = elb.profile('P000001')
+    assert person.bio.summary.startswith('Career of')
+    assert person.career_history[-1].club.venue.code == 'V000'
+    assert elb.all_teams()[1].abbreviated_name == 'BAR'
+    assert elb.all_seasons('E')[0].competition_code == 'E'
+    assert elb.game_records('C01', 'E')[0].category_code == 'points'
+    # generated payloads are deterministic
+    assert SyntheticSource(n_clubs=4)('clubs/C01') == \
+        mock_api.source('clubs/C01')
+    assert mock_api.source('people/P999999') is None
+
+
+def test_synthetic_memo():
+    source = SyntheticSource(n_people=100)
+    assert source('people/P000003') is source('people/P000003')
+    # the payloads are kept by the source only
+    ref = weakref.ref(source)
+    del source
+    gc.collect()
+    assert ref() is None
+
+
+def test_throttling(mock_api):
+    mock_api.throttle = TokenBucket(20, burst=2)
+    attempts = []
+    for code in range(1, 7):
+        client.get(client.build_url('venues', f'V{code:03d}'),
+                   hooks={'attempt': attempts.append})
+    # refused requests are retried after the advertised wait
+    assert mock_api.stats[200] == 6
+    assert mock_api.stats[429] > 0
+    assert all(a.delay <= 0.1 for a in attempts if a.status_code == 429)
+
+
+def test_errors_and_etags(mock_api):
+    mock_api.error_rate = 1.0
+    with pytest.raises(client.HTTPError):
+        client.get(client.build_url('venues'), retry=RetryPolicy(total=1))
+    mock_api.error_rate = 0.0
+    response = client.get(client.build_url('venues', 'V001'))
+    etag = response.headers['ETag']
+    response = client.get(client.build_url('venues', 'V001'),
+                          headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert mock_api.stats == {503: 1, 200: 1, 304: 1}
+
+
+def test_directory_source(tmp_path):
+    (tmp_path / 'venues').mkdir()
+    (tmp_path / 'venues' / 'V1.json').write_text(json.dumps({'code': 'V1'}))
+    source = DirectorySource(str(tmp_path))
+    assert source('venues/V1') == {'code': 'V1'}
+    assert source('venues/V2') is None
+
+
+def test_cassette_source(mock_api, monkeypatch, tmp_path):
+    path = str(tmp_path / 'people.cassette')
+    with RecordingTransport(path) as recorder:
+        client.set_session(recorder)
+        live = [p.code for p in elb.iter_profiles(page_size=30)]
+    assert len(live) == 100
+
+    # the recorded pages are served as they were, not sliced again
+    server = MockServer(CassetteSource(path)).start()
+    try:
+        monkeypatch.setitem(API_URLS, 2.0, server.url)
+        client.set_session(client.Session())
+        client.set_cache(MemoryCache())
+        assert [p.code for p in elb.iter_profiles(page_size=30)] == live
+        with pytest.raises(client.HTTPError):
+            elb.all_profile(offset=0, limit=50)
+    finally:
+        client.close()
+        server.stop()
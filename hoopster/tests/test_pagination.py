@@ -0,0 +1,75 @@
+""" """
+
+import asyncio
+
+import pytest
+
+import hoopster.elb as elb
+
+
+@pytest.mark.parametrize('prefetch', [0, 3])
+def test_iter_profiles(api_server, prefetch):
+    people = [{'code': f'P{i:03d}'} for i in range(25)]
+    api_server.routes['people'] = (200, people)
+    codes = [p.code for p in elb.iter_profiles(page_size=10,
+                                               prefetch=prefetch)]
+    assert codes == [p['code'] for p in people]
+
+
+def test_iter_stops_early(api_server):
+    api_server.routes['referees'] = (200, [{'code': 'R1'}, {'code': 'R2'}])
+    referees = elb.iter_referees(page_size=1, prefetch=1)
+    assert next(referees).code == 'R1'
+    referees.close()
+    with pytest.raises(ValueError):
+        next(elb.iter_teams(page_size=0))
+
+
+def test_async_iter_venues(api_server):
+    pytest.importorskip('aiohttp')
+    import hoopster.aio as aio
+    from hoopster.aio import elb as aio_elb
+
+    api_server.routes['venues'] = (200, [{'code': f'V{i}'}
+                                         for i in range(7)])
+
+    async def main():
+        try:
+            return [v.code async for v in aio_elb.iter_venues(page_size=3,
+                                                              prefetch=2)]
+        finally:
+            await aio.close()
+
+    assert asyncio.run(main()) == [f'V{i}' for i in range(7)]
+
+
+def test_fetch_all(api_server):
+    people = [{'code': f'P{i:03d}'} for i in range(95)]
+    api_server.routes['people'] = (200, people)
+    api_server.delay = 0.1
+    items = elb.fetch_all(elb.all_profile, page_size=10, workers=4,
+                          expected=95)
+    assert [p.code for p in items] == [p['code'] for p in people]
+    # the 11 pages were requested four at a time, not one after another
+    assert api_server.max_in_flight == 4
+
+
+def test_async_fetch_all(api_server):
+    pytest.importorskip('aiohttp')
+    import hoopster.aio as aio
+    from hoopster.aio import elb as aio_elb
+
+    api_server.routes['clubs'] = (200, [{'code': f'C{i}'} for i in range(9)])
+    api_server.delay = 0.1
+
+    async def main():
+        try:
+            return await aio_elb.fetch_all(aio_elb.all_teams, page_size=2,
+                                           workers=3, expected=9)
+        finally:
+            await aio.close()
+
+    assert [t.code for t in asyncio.run(main())] == [f'C{i}'
+                                                     for i in range(9)]
+    # the 6 pages expected are prefetched, but only 3 are requested at once
+    assert api_server.max_in_flight == 3
@@ -0,0 +1,45 @@
+""" """
+
+import asyncio
+
+import pytest
+
+import hoopster.client as client
+from hoopster.ratelimit import RateLimiter, TokenBucket
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, burst=2)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:2] == [0, 0]
+    # later callers queue behind the earlier ones
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_rate_limiter_prefixes():
+    limiter = RateLimiter(rate=100)
+    limiter.set_limit(5, prefix='people')
+    limiter.set_limit(2, prefix='competitions/*/seasons/*/games')
+
+    def rates(*path):
+        return [b.rate for b in limiter.buckets(client.build_url(*path))]
+
+    assert rates('people', 'KRV', 'bio') == [100, 5]
+    assert rates('competitions', 'E', 'seasons', 'E2021', 'games') == [100, 2]
+    assert rates('clubs') == [100]
+    limiter.set_limit(None)
+    limiter.set_limit(None, prefix='people')
+    assert rates('people') == []
+
+
+def test_async_acquire():
+    limiter = RateLimiter(rate=1000, burst=1)
+
+    async def main():
+        await asyncio.gather(*[limiter.acquire_async('venues')
+                               for _ in range(5)])
+
+    asyncio.run(main())
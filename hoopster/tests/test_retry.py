@@ -0,0 +1,45 @@
+""" """
+
+import pytest
+
+import hoopster.client as client
+from hoopster.retry import RetryPolicy, parse_retry_after
+
+
+def test_backoff():
+    policy = RetryPolicy(backoff_factor=1, backoff_max=5, jitter=0)
+    assert [policy.backoff(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+    policy = RetryPolicy(backoff_factor=1, jitter=0.5)
+    assert all(1 <= policy.backoff(2) <= 2 for _ in range(20))
+
+
+def test_retry_after():
+    assert parse_retry_after('3') == 3
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('soon') is None
+
+
+def test_retry_transient_errors(api_server):
+    api_server.routes['referees'] = [(503, {}),
+                                     (429, {}, {'Retry-After': '0'}),
+                                     (200, [])]
+    attempts = []
+    client.set_retry_policy(RetryPolicy(backoff_factor=0.01))
+    try:
+        client.get(client.build_url('referees'),
+                   hooks={'attempt': attempts.append})
+    finally:
+        client.set_retry_policy(RetryPolicy())
+    assert [a.status_code for a in attempts] == [503, 429, 200]
+    assert attempts[1].delay == 0 and attempts[2].delay is None
+
+
+def test_no_retry(api_server):
+    api_server.routes['referees'] = [(503, {}), (503, {}), (200, [])]
+    policy = RetryPolicy(backoff_factor=0.01)
+    # POST is not idempotent
+    with pytest.raises(client.HTTPError) as exc:
+        client.post(client.build_url('referees'), retry=policy)
+    assert exc.value.response.status_code == 503
+    with pytest.raises(IOError):
+        client.get(client.build_url('referees'), retry=RetryPolicy(total=1))
@@ -0,0 +1,72 @@
+""" """
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import hoopster.elb as elb
+from hoopster.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_identical_requests(api_server):
+    api_server.routes['referees/OJDN'] = (200, {'code': 'OJDN'})
+    api_server.delay = 0.2
+    with ThreadPoolExecutor(8) as pool:
+        refs = list(pool.map(lambda _: elb.referee('OJDN'), range(8)))
+    assert refs == [elb.Referee(code='OJDN')] * 8
+    assert len(api_server.requests) == 1
+
+
+def test_errors_are_shared():
+    flights = SingleFlight()
+    with pytest.raises(ZeroDivisionError):
+        flights.do('key', lambda: 1 / 0)
+    assert len(flights) == 0
+
+
+def test_async_single_flight():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'data'
+
+    async def main():
+        return await asyncio.gather(*[flights.do('url', fetch)
+                                      for _ in range(5)])
+
+    assert asyncio.run(main()) == ['data'] * 5
+    assert len(calls) == 1 and len(flights) == 0
+
+
+def test_async_cancelled_caller():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'data'
+
+    async def main():
+        leader = asyncio.ensure_future(flights.do('url', fetch))
+        follower = asyncio.ensure_future(flights.do('url', fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        # the follower still gets the shared result
+        assert await follower == 'data'
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        # the call is cancelled once nobody waits for it
+        alone = asyncio.ensure_future(flights.do('other', fetch))
+        await asyncio.sleep(0.01)
+        alone.cancel()
+        await asyncio.sleep(0)
+        assert len(flights) == 0
+
+    asyncio.run(main())
+    assert len(calls) == 2
@@ -0,0 +1,87 @@
+""" """
+
+import asyncio
+import json
+
+import pytest
+
+import hoopster.client as client
+import hoopster.elb as elb
+from hoopster import tracing
+
+
+@pytest.fixture
+def collector():
+    collector = tracing.InMemoryCollector()
+    previous = tracing.set_collector(collector)
+    yield collector
+    tracing.set_collector(previous)
+
+
+def test_disabled():
+    assert tracing.get_collector() is None
+    with tracing.span('fetch') as span:
+        span.set(status_code=200)
+        assert tracing.current_span() is None
+
+
+def test_profile_spans(api_server, collector):
+    api_server.routes['people/P1'] = (200, {'code': 'P1', 'passportName': 'A'})
+    api_server.routes['people/P1/bio'] = (200, {'career': 'c', 'misc': 'm'})
+    api_server.routes['people/P1/seasons'] = (200, [])
+    person = elb.profile('P1')
+    assert person.passport_name == 'A'
+
+    [root] = collector.roots()
+    assert root.name == 'elb.profile'
+    # the sub-requests run in the thread pool, nested in the same span
+    names = [s.name for s in collector.children(root)]
+    assert sorted(names[:-1]) == ['decode'] * 3 + ['fetch'] * 3
+    assert names[-1] == 'construct'
+    assert all(s.trace_id == root.trace_id for s in collector.spans)
+    urls = [s.attributes['url'] for s in collector.spans
+            if s.name == 'fetch' and s.attributes['status_code'] == 200]
+    assert sorted(u.split('/people/')[1] for u in urls) == [
+        'P1', 'P1/bio', 'P1/seasons']
+    assert collector.format().startswith('elb.profile ')
+
+
+def test_errors(api_server, collector):
+    with pytest.raises(client.HTTPError):
+        elb.game_stats('E', 'E2021', 1)
+    fetch, root = collector.spans
+    assert fetch.attributes['status_code'] == 404 and fetch.error is None
+    assert root.name == 'elb.game_stats' and 'HTTPError' in root.error
+
+
+def test_propagation(collector):
+    with tracing.span('parent') as parent:
+        future = client.submit(tracing.current_span)
+        assert future.result() is parent
+
+    async def child():
+        with tracing.span('child'):
+            await asyncio.sleep(0)
+
+    async def main():
+        with tracing.span('root'):
+            await asyncio.gather(child(), child())
+
+    asyncio.run(main())
+    root = collector.spans[-1]
+    assert [s.name for s in collector.children(root)] == ['child', 'child']
+
+
+def test_file_exporter(tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    with tracing.FileExporter(str(path)) as exporter:
+        previous = tracing.set_collector(exporter)
+        try:
+            with tracing.span('parent'):
+                with tracing.span('child', url='x'):
+                    pass
+        finally:
+            tracing.set_collector(previous)
+    child, parent = [json.loads(line) for line in path.read_text().splitlines()]
+    assert child['parent_id'] == parent['span_id']
+    assert child['attributes'] == {'url': 'x'}
@@ -0,0 +1,45 @@
+""" """
+
+import pytest
+
+import hoopster.client as client
+import hoopster.elb as elb
+from hoopster.transport import RecordingTransport, ReplayTransport
+
+
+def test_record_and_replay(api_server, tmp_path):
+    path = str(tmp_path / 'referees.cassette')
+    api_server.routes['referees'] = (200, [{'code': 'R1'}])
+    api_server.routes['referees/R1'] = [(200, {'code': 'R1'}),
+                                        (200, {'code': 'R1', 'name': 'A'})]
+
+    with RecordingTransport(path) as recorder:
+        client.set_session(recorder)
+        live = [elb.all_referees(), elb.referee('R1'), elb.referee('R1')]
+    assert len(api_server.requests) == 3
+
+    replay = ReplayTransport(path, latency=0.01)
+    assert len(replay) == 3
+    client.set_session(replay)
+    assert [elb.all_referees(), elb.referee('R1'),
+            elb.referee('R1')] == live
+    assert len(api_server.requests) == 3
+
+    with pytest.raises(LookupError):
+        elb.venue('missing')
+    client.set_session(ReplayTransport(path, strict=False))
+    with pytest.raises(client.HTTPError):
+        elb.venue('missing')
+
+
+def test_replay_stream(api_server, tmp_path):
+    path = str(tmp_path / 'venues.cassette')
+    api_server.routes['venues'] = (200, [{'code': 'V1'}, {'code': 'V2'}])
+    with RecordingTransport(path) as recorder:
+        client.set_session(recorder)
+        live = elb.venues(stream=True)
+
+    client.set_session(ReplayTransport(path))
+    assert elb.venues(stream=True) == live
+    assert [v.code for v in live] == ['V1', 'V2']
+    assert len(api_server.requests) == 1
@@ -0,0 +1,63 @@
+""" """
+
+import json
+
+import pytest
+
+from hoopster.utils import (camel_to_snake, iter_json_array,
+                            normalize_nested_dict_keys)
+
+
+def test_camel_to_snake():
+    assert camel_to_snake('fieldGoalsMade2') == 'field_goals_made2'
+    assert camel_to_snake('isVirtual') == 'is_virtual'
+
+
+def test_normalize_nested_dict_keys():
+    data = {'gameCode': 1, 'local': {'playerName': 'A', 'lastFive': [
+        {'winLoss': 'W'}, 'text', [{'innerKey': 1}]]}}
+    expected = {'game_code': 1, 'local': {'player_name': 'A', 'last_five': [
+        {'win_loss': 'W'}, 'text', [{'inner_key': 1}]]}}
+    snapshot = json.dumps(data)
+    assert normalize_nested_dict_keys(data) == expected
+    assert json.dumps(data) == snapshot
+    local = data['local']
+    assert normalize_nested_dict_keys(data, inplace=True) is data
+    assert data == expected and data['local'] is local
+
+
+def test_normalize_nested_dict_keys_deep():
+    data = leaf = {}
+    for _ in range(5000):
+        leaf['nestedValue'] = leaf = {}
+    result = normalize_nested_dict_keys(data)
+    for _ in range(5000):
+        result = result['nested_value']
+    assert result == {}
+
+
+@pytest.mark.parametrize('size', [1, 3, 16, 4096])
+def test_iter_json_array(size):
+    data = [{'code': 'é' * i, 'values': [1, 2.5, None]} for i in range(20)]
+    data += [123456, 'text', [], {}]
+    raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    chunks = (raw[i:i + size] for i in range(0, len(raw), size))
+    assert list(iter_json_array(chunks)) == data
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'[1.', b'5, 2]'], [1.5, 2]),
+    ([b'[1e', b'3]'], [1e3]),
+    ([b'[2.5E', b'-', b'2, -', b'1]'], [2.5e-2, -1]),
+    ([b'[1', b'0.0', b'1]'], [10.01]),
+])
+def test_iter_json_array_numbers(chunks, expected):
+    assert list(iter_json_array(chunks)) == expected
+
+
+def test_iter_json_array_errors():
+    assert list(iter_json_array([b' [ ] '])) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'[1, 2']))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'{"a": 1}']))
@@ -0,0 +1,247 @@
+"""Tracing of the API calls.
+
+Composite calls like :func:`hoopster.elb.profile` open a span, and the
+HTTP fetches, JSON decoding, key normalization and dataclass construction
+they run are recorded as nested spans. Spans follow the calls into the
+thread pool of :func:`hoopster.client.submit` and into asyncio tasks::
+
+    from hoopster import tracing
+
+    collector = tracing.InMemoryCollector()
+    tracing.set_collector(collector)
+    elb.profile('P000001')
+    print(collector.format())
+
+Tracing is disabled, at almost no cost, until a collector is set.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+
+_collector = None
+_current = contextvars.ContextVar('hoopster_span', default=None)
+
+
+def get_collector():
+    """Return the collector receiving the finished spans, or None."""
+    return _collector
+
+
+def set_collector(collector):
+    """Enable tracing and send the finished spans to ``collector``.
+
+    Parameters
+    ----------
+    collector : object or None
+        Object with an ``export(span)`` method, e.g.
+        :class:`InMemoryCollector` or :class:`FileExporter`. None disables
+        tracing.
+
+    Returns
+    -------
+    previous : object or None
+        The collector that was in use.
+    """
+    global _collector
+    previous = _collector
+    _collector = collector
+    return previous
+
+
+def current_span():
+    """Return the span open in the current context, or None."""
+    return _current.get()
+
+
+def _new_id():
+    return '{:016x}'.format(random.getrandbits(64))
+
+
+class Span:
+    """Timed operation, possibly nested in another span.
+
+    Attributes
+    ----------
+    name : str
+    trace_id : str
+        id shared by the spans of the same root call
+    span_id : str
+    parent_id : str or None
+    start : float
+        start time, in seconds since the epoch
+    duration : float
+        duration in seconds, None while the span is open
+    attributes : dict
+    error : str or None
+        representation of the exception that ended the span
+    """
+
+    def __init__(self, name, parent=None, **attributes):
+        self.name = name
+        self.span_id = _new_id()
+        self.parent_id = None if parent is None else parent.span_id
+        self.trace_id = self.span_id if parent is None else parent.trace_id
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration = None
+        self.error = None
+        self._start = time.perf_counter()
+        self._token = None
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if exc is not None:
+            self.error = repr(exc)
+        _current.reset(self._token)
+        collector = _collector
+        if collector is not None:
+            collector.export(self)
+
+    def to_dict(self):
+        return {'name': self.name, 'trace_id': self.trace_id,
+                'span_id': self.span_id, 'parent_id': self.parent_id,
+                'start': self.start, 'duration': self.duration,
+                'attributes': self.attributes, 'error': self.error}
+
+    def __repr__(self):
+        return '<Span {} {}>'.format(self.name, self.span_id)
+
+
+class _NoSpan:
+    """Span used when tracing is disabled."""
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, **attributes):
+    """Return a span, to be used as a context manager, nested in the
+    current one.
+
+    Parameters
+    ----------
+    name : str
+        kind of operation, e.g. ``'fetch'`` or ``'decode'``
+    attributes : dict, optional
+        details of the operation, e.g. its url
+    """
+    if _collector is None:
+        return _NO_SPAN
+    return Span(name, _current.get(), **attributes)
+
+
+def traced(name=None):
+    """Decorate a function, or coroutine function, to run it in a span.
+
+    Parameters
+    ----------
+    name : str, optional
+        Name of the span. Default: the function name prefixed with the
+        name of its module, e.g. ``'elb.profile'``.
+    """
+    def decorator(fn):
+        span_name = name or '{}.{}'.format(fn.__module__.rsplit('.', 1)[-1],
+                                           fn.__qualname__)
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with span(span_name):
+                    return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class InMemoryCollector:
+    """Keep the finished spans in a list, in the order they end."""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def roots(self):
+        """Return the spans without parent."""
+        return [s for s in self.spans if s.parent_id is None]
+
+    def children(self, span):
+        """Return the spans directly nested in ``span``, by start time."""
+        return sorted((s for s in self.spans if s.parent_id == span.span_id),
+                      key=lambda s: s.start)
+
+    def format(self):
+        """Return the spans as an indented tree, with their durations."""
+        lines = []
+
+        def visit(span, depth):
+            lines.append('{}{} {:.1f} ms'.format('  ' * depth, span.name,
+                                                 span.duration * 1000))
+            for child in self.children(span):
+                visit(child, depth + 1)
+
+        for root in sorted(self.roots(), key=lambda s: s.start):
+            visit(root, 0)
+        return '\n'.join(lines)
+
+
+class FileExporter:
+    """Append the finished spans to a file, one JSON object per line.
+
+    Parameters
+    ----------
+    path : str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,258 @@
+"""Transports sending the HTTP requests of the client.
+
+A transport is any object with the ``request``/``close`` interface of
+:class:`Transport`. The client uses a pooled :class:`Session` by default;
+:class:`RecordingTransport` and :class:`ReplayTransport` capture real
+responses to a cassette file and serve them back offline::
+
+    import hoopster.client as client
+    from hoopster.transport import RecordingTransport, ReplayTransport
+
+    client.set_session(RecordingTransport('season.cassette'))
+    elb.games('E', 'E2021')  # hits the API, writes the cassette
+
+    client.set_session(ReplayTransport('season.cassette', latency=0.05))
+    elb.games('E', 'E2021')  # offline, 50 ms per request
+"""
+
+import base64
+import gzip
+import io
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.hooks import dispatch_hook
+from requests.structures import CaseInsensitiveDict
+
+from hoopster.cache import route
+
+
+class Transport:
+    """Interface of the objects sending the requests of the client."""
+
+    def request(self, method, url, **kwargs):
+        """Send a request.
+
+        Parameters
+        ----------
+        method : str
+        url : str
+        kwargs : dict
+            ``json``, ``headers``, ``timeout``, ``hooks`` and ``stream``
+            parameters of :meth:`requests.Session.request`
+
+        Returns
+        -------
+        response : requests.Response
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release the resources of the transport."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Session(Transport):
+    """Thread-safe pool of persistent HTTP connections.
+
+    The underlying :class:`requests.Session` is created on first use, so
+    a ``Session`` can be instantiated at import time and shared by every
+    thread of the process.
+
+    Parameters
+    ----------
+    pool_connections : int, optional
+        Number of hosts for which a connection pool is kept.
+    pool_maxsize : int, optional
+        Maximum number of connections kept alive per host.
+    pool_block : bool, optional
+        If True, wait for a free connection when a host pool is exhausted
+        instead of opening a throw-away one.
+    keep_alive : bool, optional
+        If False, connections are closed after each response.
+    headers : dict, optional
+        Default HTTP headers sent with every request.
+
+    Examples
+    --------
+    >>> with Session(pool_maxsize=20) as session:  # doctest: +SKIP
+    ...     previous = client.set_session(session)
+    ...     elb.games('E', 'E2021')
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, keep_alive=True, headers=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.headers = dict(headers or {})
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Return the underlying :class:`requests.Session`."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create()
+        return self._session
+
+    def _create(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the connection pool."""
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections.
+
+        The session can still be used afterwards, a new pool is created
+        on the next request.
+        """
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+def _key(method, url):
+    # urls are made relative to the API root so cassettes can be replayed
+    # whatever the root, e.g. against a local server
+    return '{} {}?{}'.format(method.upper(), route(url), urlsplit(url).query)
+
+
+class RecordingTransport(Transport):
+    """Send requests with another transport and record the responses.
+
+    Each response is appended to a gzip-compressed cassette file of JSON
+    lines, readable by :class:`ReplayTransport`.
+
+    Parameters
+    ----------
+    path : str
+        path of the cassette file
+    transport : Transport, optional
+        Transport sending the requests. Default: a new :class:`Session`.
+    mode : {'w', 'a'}, optional
+        Overwrite or extend an existing cassette.
+    """
+
+    def __init__(self, path, transport=None, mode='w'):
+        self.path = path
+        self.transport = transport or Session()
+        self._file = gzip.open(path, mode + 't', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        response = self.transport.request(method, url, **kwargs)
+        record = {'method': method.upper(), 'url': url,
+                  'status': response.status_code,
+                  'headers': dict(response.headers),
+                  'body': base64.b64encode(response.content).decode('ascii')}
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self._file.write(line)
+        return response
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Serve the responses of a cassette without network access.
+
+    Requests are matched on their method, route and query string. Repeated
+    requests get the recorded responses in order, the last one being
+    served again once they are exhausted.
+
+    Parameters
+    ----------
+    path : str
+        path of a cassette written by :class:`RecordingTransport`
+    latency : float or callable, optional
+        Simulated latency of each request, in seconds, or a function of
+        the url returning it.
+    jitter : float, optional
+        Random extra latency, uniformly drawn between 0 and ``jitter``.
+    strict : bool, optional
+        If True, unknown requests raise a LookupError, otherwise they get
+        a 404 response.
+    """
+
+    def __init__(self, path, latency=0.0, jitter=0.0, strict=True):
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.strict = strict
+        self._records = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    key = _key(record['method'], record['url'])
+                    self._records.setdefault(key, []).append(record)
+
+    def __len__(self):
+        return sum(len(r) for r in self._records.values())
+
+    def request(self, method, url, hooks=None, **kwargs):
+        key = _key(method, url)
+        with self._lock:
+            records = self._records.get(key)
+            if records is None:
+                record = None
+            elif len(records) > 1:
+                record = records.pop(0)
+            else:
+                record = records[0]
+        if record is None and self.strict:
+            raise LookupError("No recorded response for {}".format(key))
+
+        latency = self.latency(url) if callable(self.latency) \
+            else self.latency
+        latency += random.uniform(0, self.jitter) if self.jitter else 0
+        if latency > 0:
+            time.sleep(latency)
+
+        if record is None:
+            record = {'status': 404, 'headers': {}, 'body': ''}
+        response = requests.Response()
+        response.status_code = record['status']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        body = base64.b64decode(record['body'])
+        response._content = body
+        # the body is already read, but streamed calls still iterate over
+        # and close the raw stream
+        response._content_consumed = True
+        response.raw = io.BytesIO(body)
+        response.url = url
+        response.request = requests.Request(method, url).prepare()
+        response.encoding = requests.utils.get_encoding_from_headers(
+            response.headers)
+        return dispatch_hook('response', hooks, response)
@@ -1,3 +1,6 @@
+import codecs
+import functools
+import json
 import re
 
 
@@ -5,22 +8,147 @@ def remove_invalid_characters(xml_data):
     return re.sub(r'^.*?<', '<', xml_data)
 
 
+@functools.lru_cache(maxsize=4096)
 def camel_to_snake(name):
+    """Return the snake_case version of a camelCase key.
+
+    Translations are memoized in a bounded table, since payloads repeat
+    the same keys over and over.
+    """
     name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
 
 
+def snake_to_camel(name):
+    """Return the camelCase API key of a snake_case name, e.g.
+    ``'tv_code'`` gives ``'tvCode'``."""
+    first, *others = name.split('_')
+    return first + ''.join(w[:1].upper() + w[1:] for w in others)
+
+
 def normalize_keys(data):
-    new_data = dict((camel_to_snake(key), value)
-                    for (key, value) in data.items())
-    return new_data
-
-
-def normalize_nested_dict_keys(data):
-    data = normalize_keys(data)
-    for k, v in data.items():
-        if isinstance(v, dict):     # For DICT
-            data[k] = normalize_nested_dict_keys(v)
-        elif isinstance(v, list):   # For LIST
-            data[k] = [normalize_nested_dict_keys(i) for i in v]
-    return data
+    convert = camel_to_snake
+    return {convert(key): value for key, value in data.items()}
+
+
+def normalize_nested_dict_keys(data, inplace=False):
+    """Convert to snake_case the keys of nested dicts and lists of dicts.
+
+    The structure is walked iteratively, so deep payloads do not hit the
+    recursion limit.
+
+    Parameters
+    ----------
+    data : dict
+        decoded JSON object
+    inplace : bool, optional
+        If True, the dicts of ``data`` are modified instead of copied.
+        Decoded JSON returned by :func:`hoopster.client.get_json` is shared
+        and must not be modified.
+
+    Returns
+    -------
+    data : dict
+    """
+    if inplace:
+        _normalize_inplace(data)
+        return data
+
+    convert = camel_to_snake
+    root = {}
+    stack = [(data, root)]
+    while stack:
+        src, dst = stack.pop()
+        if dst.__class__ is dict:
+            for key, value in src.items():
+                if isinstance(value, (dict, list)):
+                    copy = {} if isinstance(value, dict) else []
+                    stack.append((value, copy))
+                    value = copy
+                dst[convert(key)] = value
+        else:
+            for value in src:
+                if isinstance(value, (dict, list)):
+                    copy = {} if isinstance(value, dict) else []
+                    stack.append((value, copy))
+                    value = copy
+                dst.append(value)
+    return root
+
+
+def _normalize_inplace(data):
+    convert = camel_to_snake
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            items = list(obj.items())
+            obj.clear()
+            for key, value in items:
+                obj[convert(key)] = value
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+        else:
+            stack.extend(v for v in obj if isinstance(v, (dict, list)))
+
+
+def iter_json_array(chunks):
+    """Decode one by one the elements of a JSON array.
+
+    Parameters
+    ----------
+    chunks : iterable of bytes
+        UTF-8 encoded JSON array, split anywhere, e.g.
+        ``response.iter_content(chunk_size)``
+
+    Yields
+    ------
+    element :
+        decoded element of the array, as soon as it is complete
+    """
+    scanner = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf, pos, eof = '', 0, False
+
+    def fill(buf, pos):
+        chunk = next(chunks, None)
+        text = utf8.decode(chunk or b'', final=chunk is None)
+        return buf[pos:] + text, 0, chunk is None
+
+    def skip(buf, pos, eof):
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\n\r':
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf, pos, eof
+            buf, pos, eof = fill(buf, pos)
+
+    buf, pos, eof = skip(buf, pos, eof)
+    if buf[pos:pos + 1] != '[':
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    buf, pos, eof = skip(buf, pos + 1, eof)
+    if buf[pos:pos + 1] == ']':
+        return
+
+    while True:
+        try:
+            element, end = scanner.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            buf, pos, eof = fill(buf, pos)
+            continue
+        if not eof and (end == len(buf) or buf[end] in '.eE+-'):
+            # a number may continue in the next chunk, e.g. after '1.'
+            buf, pos, eof = fill(buf, pos)
+            continue
+        yield element
+
+        buf, pos, eof = skip(buf, end, eof)
+        char = buf[pos:pos + 1]
+        if char == ']':
+            return
+        if char != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+        buf, pos, eof = skip(buf, pos + 1, eof)
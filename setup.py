@@ -59,6 +59,9 @@ setup(
         ]
     },
     install_requires=requirements,
+    extras_require={
+        'aio': ['aiohttp'],
+    },
     license="BSD (3-clause)",
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
@@ -0,0 +1,97 @@
+"""Report the memory used by the hoopster.elb models.
+
+Objects are built with ``from_api`` from the payloads of the mock API, once
+with the slotted models and once with the same models without
+``__slots__``, and the memory they allocate is measured with tracemalloc.
+The payloads are decoded beforehand, so field values shared with them are
+not counted.
+
+Usage::
+
+    python tools/bench_memory.py [--count 2000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import MISSING, field, fields, is_dataclass
+
+import hoopster.decorators as dec
+import hoopster.elb as elb
+from hoopster.mockserver import SyntheticSource
+
+_unslotted = {}
+
+
+def unslotted(cls):
+    """Return a copy of the model ``cls``, and of its nested models,
+    without ``__slots__``."""
+    if cls not in _unslotted:
+        annotations, namespace = {}, {}
+        for f in fields(cls):
+            ft = f.type
+            if getattr(ft, '__origin__', None) is list and \
+                    is_dataclass(ft.__args__[0]):
+                ft = list[unslotted(ft.__args__[0])]
+            elif is_dataclass(ft):
+                ft = unslotted(ft)
+            annotations[f.name] = ft
+            if f.default is MISSING:
+                namespace[f.name] = field(metadata=f.metadata)
+            else:
+                namespace[f.name] = field(default=f.default,
+                                          metadata=f.metadata)
+        namespace['__annotations__'] = annotations
+        namespace['__module__'] = __name__
+        _unslotted[cls] = dec.nested_dataclass(frozen=True)(
+            type(cls.__name__, (), namespace))
+    return _unslotted[cls]
+
+
+def measure(cls, payloads):
+    """Return the bytes allocated per object built from ``payloads``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls.from_api(p) for p in payloads]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used / len(payloads)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=2000,
+                        help='number of objects of each model')
+    args = parser.parse_args(argv)
+
+    source = SyntheticSource(n_people=args.count)
+    people = source('people')[:args.count]
+    games = []
+    for season in source('competitions/E/seasons'):
+        games += source('competitions/E/seasons/{}/games'.format(
+            season['code']))
+    games = games[:args.count]
+    stats = []
+    for game in games:
+        if len(stats) >= args.count:
+            break
+        box = source('competitions/E/seasons/{}/games/{}/stats'.format(
+            game['season']['code'], game['gameCode']))
+        stats += [p['stats'] for p in box['local']['players']]
+    stats = stats[:args.count]
+
+    print('{:<12} {:>10} {:>10} {:>8}'.format('model', 'before', 'after',
+                                              'saved'))
+    for cls, payloads in [(elb.Person, people), (elb.Game, games),
+                          (elb.PlayerStats, stats)]:
+        before = measure(unslotted(cls), payloads)
+        after = measure(cls, payloads)
+        print('{:<12} {:>10.0f} {:>10.0f} {:>7.0%}'.format(
+            cls.__name__, before, after, 1 - after / before))
+    print('bytes per object, nested models included')
+
+
+if __name__ == '__main__':
+    main()